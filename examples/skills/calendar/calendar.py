@@ -6,11 +6,17 @@ HTTP API service for calendar operations
 
 import os
 import json
+import random
+import threading
+import time
 from datetime import datetime, timedelta
+import httplib2
+import google_auth_httplib2
 from flask import Flask, request, jsonify
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
 
 app = Flask(__name__)
 
@@ -21,20 +27,56 @@ CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
 CALENDAR_ID = os.environ.get('GOOGLE_CALENDAR_ID', 'primary')
 PORT = int(os.environ.get('PORT', 5000))
 
+# Rate-limited (429) and server-side (5xx) failures are retried with
+# exponential backoff instead of failing the whole call
+NUM_RETRIES = 5
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF_SECONDS = 60
+
+_service = None
+_service_lock = threading.Lock()
+_thread_local = threading.local()
+
+def _thread_http():
+    """Return this thread's keep-alive Http, creating it on first use"""
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = _thread_local.http = httplib2.Http()
+    return http
+
 def get_calendar_service():
-    """Build calendar service from refresh token"""
-    creds = Credentials(
-        None,  # No access token, we'll use refresh
-        refresh_token=REFRESH_TOKEN,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=CLIENT_ID,
-        client_secret=CLIENT_SECRET
-    )
+    """Return the shared calendar service, building it on first use.
+
+    The discovery document is parsed once per process instead of on every
+    request. httplib2 connections are not thread-safe, so API requests use a
+    per-thread Http that keeps its TLS connection alive between calls; the
+    credentials are shared and refreshed automatically when they expire.
+    """
+    global _service
+    if _service is not None:
+        return _service
     
-    # Refresh the token
-    creds.refresh(Request())
+    with _service_lock:
+        if _service is None:
+            creds = Credentials(
+                None,  # No access token, refreshed on first request
+                refresh_token=REFRESH_TOKEN,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=CLIENT_ID,
+                client_secret=CLIENT_SECRET
+            )
+            
+            def build_request(http, *args, **kwargs):
+                authed_http = google_auth_httplib2.AuthorizedHttp(creds, http=_thread_http())
+                return HttpRequest(authed_http, *args, **kwargs)
+            
+            _service = build(
+                'calendar', 'v3',
+                http=google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http()),
+                requestBuilder=build_request
+            )
     
-    return build('calendar', 'v3', credentials=creds)
+    return _service
 
 @app.route('/health')
 def health():
@@ -71,7 +113,7 @@ def list_events():
             timeMax=time_max,
             singleEvents=True,
             orderBy='startTime'
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         
         events = events_result.get('items', [])
         
@@ -87,32 +129,37 @@ def list_events():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_event_body(data):
+    """Build a Calendar API event body from request data"""
+    event = {
+        'summary': data.get('title', 'New Event'),
+        'start': {
+            'dateTime': data['start'],
+            'timeZone': 'UTC'
+        },
+        'end': {
+            'dateTime': data['end'],
+            'timeZone': 'UTC'
+        }
+    }
+    
+    if 'attendees' in data:
+        event['attendees'] = [{'email': e} for e in data['attendees']]
+    
+    return event
+
 @app.route('/events', methods=['POST'])
 def create_event():
     """Create a new event"""
     try:
         data = request.json
-        
-        event = {
-            'summary': data.get('title', 'New Event'),
-            'start': {
-                'dateTime': data['start'],
-                'timeZone': 'UTC'
-            },
-            'end': {
-                'dateTime': data['end'],
-                'timeZone': 'UTC'
-            }
-        }
-        
-        if 'attendees' in data:
-            event['attendees'] = [{'email': e} for e in data['attendees']]
+        event = build_event_body(data)
         
         service = get_calendar_service()
         created = service.events().insert(
             calendarId=CALENDAR_ID,
             body=event
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         
         return jsonify({
             'success': True,
@@ -123,6 +170,74 @@ def create_event():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Google's batch endpoint accepts at most 50 calls per request
+BATCH_SIZE = 50
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt, honoring Retry-After"""
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_BACKOFF_SECONDS)
+        except ValueError:
+            pass
+    return min(2 ** attempt + random.random(), MAX_BACKOFF_SECONDS)
+
+@app.route('/events/batch', methods=['POST'])
+def create_events_batch():
+    """Create many events, packing up to BATCH_SIZE inserts per HTTP request
+    
+    Inserts that fail with a retryable status are sent again in a later
+    batch, so one throttled entry does not cost the whole request.
+    """
+    try:
+        events = request.json.get('events', [])
+        service = get_calendar_service()
+        results = [None] * len(events)
+        pending = list(range(len(events)))
+        attempt = 0
+        
+        while pending:
+            retry = []
+            retry_after = []
+            
+            def callback(request_id, response, exception):
+                index = int(request_id)
+                if exception is None:
+                    results[index] = {
+                        'success': True,
+                        'id': response['id'],
+                        'link': response.get('htmlLink')
+                    }
+                elif (isinstance(exception, HttpError)
+                        and exception.resp.status in RETRYABLE_STATUSES
+                        and attempt < NUM_RETRIES):
+                    retry.append(index)
+                    retry_after.append(exception.resp.get('retry-after'))
+                else:
+                    results[index] = {'success': False, 'error': str(exception)}
+            
+            for offset in range(0, len(pending), BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=callback)
+                for index in pending[offset:offset + BATCH_SIZE]:
+                    batch.add(
+                        service.events().insert(
+                            calendarId=CALENDAR_ID,
+                            body=build_event_body(events[index])
+                        ),
+                        request_id=str(index)
+                    )
+                batch.execute()
+            
+            if retry:
+                time.sleep(backoff_delay(attempt, next(filter(None, retry_after), None)))
+            pending = sorted(retry)
+            attempt += 1
+        
+        return jsonify({'results': results})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/free-slots', methods=['GET'])
 def find_free_slots():
     """Find free time slots for a date"""
@@ -148,7 +263,7 @@ def find_free_slots():
             timeMax=day_end.isoformat() + 'Z',
             singleEvents=True,
             orderBy='startTime'
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         
         events = events_result.get('items', [])
         
@@ -13,6 +13,25 @@ import fs from 'fs';
 // Google Calendar API base URL
 const CALENDAR_API_BASE = 'https://www.googleapis.com/calendar/v3';
 
+// How long free/busy and event list responses are reused, in milliseconds
+const RESPONSE_CACHE_TTL_MS = 3 * 60 * 1000;
+
+// Upper bound on cached responses per cache; the oldest entry is evicted first
+const RESPONSE_CACHE_MAX_ENTRIES = 256;
+
+// Partial-response masks limited to the fields parseEvent() and listCalendars() read
+const EVENT_LIST_FIELDS =
+  'items(id,summary,description,location,start,end,' +
+  'attendees(email,displayName,responseStatus,optional),organizer(email,displayName),' +
+  'recurrence,recurringEventId,status,visibility,created,updated,htmlLink,iCalUID,colorId),' +
+  'nextPageToken,nextSyncToken';
+const CALENDAR_LIST_FIELDS =
+  'items(id,summary,description,primary,selected,backgroundColor,foregroundColor,accessRole,timeZone),' +
+  'nextPageToken';
+
+// Free/busy queries are widened to whole weeks so nearby windows share a fetch
+const WEEK_MS = 7 * 24 * 60 * 60 * 1000;
+
 /**
  * Calendar event attendee
  */
@@ -149,6 +168,23 @@ export interface UpdateEventOptions {
   visibility?: 'default' | 'public' | 'private' | 'confidential';
 }
 
+/**
+ * List events options
+ */
+export interface ListEventsOptions {
+  calendarId?: string;
+  timeMin?: string;
+  timeMax?: string;
+  maxResults?: number;
+  pageToken?: string;
+  showDeleted?: boolean;
+  singleEvents?: boolean;
+  orderBy?: 'startTime' | 'updated';
+  query?: string;
+  /** Partial-response mask; defaults to the fields CalendarEvent is built from */
+  fields?: string;
+}
+
 /**
  * List events result
  */
@@ -183,6 +219,21 @@ export interface CalendarSkillConfig {
   defaultCalendarId?: string;
 }
 
+/**
+ * Store a response, dropping expired entries and evicting the oldest one when full
+ */
+function cacheResponse<T extends { fetchedAt: number }>(cache: Map<string, T>, key: string, entry: T): void {
+  const now = Date.now();
+  for (const [k, v] of cache) {
+    if (now - v.fetchedAt >= RESPONSE_CACHE_TTL_MS) cache.delete(k);
+  }
+  cache.delete(key);
+  if (cache.size >= RESPONSE_CACHE_MAX_ENTRIES) {
+    cache.delete(cache.keys().next().value as string);
+  }
+  cache.set(key, entry);
+}
+
 // Promisify database operations
 function run(db: sqlite3.Database, sql: string, params: any[] = []): Promise<void> {
   return new Promise((resolve, reject) => {
@@ -222,6 +273,8 @@ export class CalendarSkill {
   private defaultCalendarId: string;
   private db: sqlite3.Database | null = null;
   private initPromise: Promise<void> | null = null;
+  private freeBusyCache = new Map<string, { fetchedAt: number; busy: TimeSlot[] }>();
+  private eventsCache = new Map<string, { fetchedAt: number; data: GoogleEventsResponse }>();
 
   constructor(config: CalendarSkillConfig = {}) {
     this.profile = config.profile || 'default';
@@ -378,19 +431,31 @@ export class CalendarSkill {
   async listCalendars(): Promise<CalendarListEntry[]> {
     await this.ensureConnected();
 
-    const response = await this.googleClient.fetch(
-      `${CALENDAR_API_BASE}/users/me/calendarList`
-    );
+    const items: GoogleCalendarListEntry[] = [];
+    let pageToken: string | undefined;
+    do {
+      const params = new URLSearchParams({ fields: CALENDAR_LIST_FIELDS });
+      if (pageToken) {
+        params.set('pageToken', pageToken);
+      }
 
-    if (!response.ok) {
-      throw new Error(`Failed to list calendars: ${response.statusText}`);
-    }
+      const response = await this.googleClient.fetch(
+        `${CALENDAR_API_BASE}/users/me/calendarList?${params.toString()}`
+      );
 
-    const data = await response.json() as {
-      items?: GoogleCalendarListEntry[];
-    };
+      if (!response.ok) {
+        throw new Error(`Failed to list calendars: ${response.statusText}`);
+      }
 
-    const calendars = (data.items || []).map(cal => ({
+      const data = await response.json() as {
+        items?: GoogleCalendarListEntry[];
+        nextPageToken?: string;
+      };
+      items.push(...(data.items || []));
+      pageToken = data.nextPageToken;
+    } while (pageToken);
+
+    const calendars = items.map(cal => ({
       id: cal.id,
       summary: cal.summary,
       description: cal.description,
@@ -414,17 +479,7 @@ export class CalendarSkill {
   /**
    * List events from a calendar
    */
-  async listEvents(options: {
-    calendarId?: string;
-    timeMin?: string;
-    timeMax?: string;
-    maxResults?: number;
-    pageToken?: string;
-    showDeleted?: boolean;
-    singleEvents?: boolean;
-    orderBy?: 'startTime' | 'updated';
-    query?: string;
-  } = {}): Promise<ListEventsResult> {
+  async listEvents(options: ListEventsOptions = {}): Promise<ListEventsResult> {
     await this.ensureConnected();
 
     const calendarId = options.calendarId || this.defaultCalendarId;
@@ -453,16 +508,26 @@ export class CalendarSkill {
     if (options.query) {
       params.set('q', options.query);
     }
+    params.set('fields', options.fields || EVENT_LIST_FIELDS);
+
+    const url = `${CALENDAR_API_BASE}/calendars/${encodeURIComponent(calendarId)}/events?${params.toString()}`;
+    const cached = this.eventsCache.get(url);
+    if (cached && Date.now() - cached.fetchedAt < RESPONSE_CACHE_TTL_MS) {
+      return {
+        events: (cached.data.items || []).map(item => this.parseEvent(item, calendarId)),
+        nextPageToken: cached.data.nextPageToken,
+        nextSyncToken: cached.data.nextSyncToken,
+      };
+    }
 
-    const response = await this.googleClient.fetch(
-      `${CALENDAR_API_BASE}/calendars/${encodeURIComponent(calendarId)}/events?${params.toString()}`
-    );
+    const response = await this.googleClient.fetch(url);
 
     if (!response.ok) {
       throw new Error(`Failed to list events: ${response.statusText}`);
     }
 
     const data = await response.json() as GoogleEventsResponse;
+    cacheResponse(this.eventsCache, url, { fetchedAt: Date.now(), data });
 
     const events = (data.items || []).map(item => this.parseEvent(item, calendarId));
 
@@ -479,6 +544,28 @@ export class CalendarSkill {
     };
   }
 
+  /**
+   * List events from several calendars at once.
+   * Requests run concurrently, so wall time tracks the slowest calendar
+   * rather than the sum of all round trips. Results are keyed by calendar ID.
+   */
+  async listEventsForCalendars(
+    calendarIds: string[],
+    options: Omit<ListEventsOptions, 'calendarId' | 'pageToken'> = {}
+  ): Promise<Record<string, ListEventsResult>> {
+    await this.ensureConnected();
+
+    const results = await Promise.all(
+      calendarIds.map(calendarId => this.listEvents({ ...options, calendarId }))
+    );
+
+    const byCalendar: Record<string, ListEventsResult> = {};
+    calendarIds.forEach((calendarId, i) => {
+      byCalendar[calendarId] = results[i];
+    });
+    return byCalendar;
+  }
+
   /**
    * Get a single event
    */
@@ -554,6 +641,7 @@ export class CalendarSkill {
       const error = await response.text();
       throw new Error(`Failed to create event: ${error}`);
     }
+    this.invalidateResponseCache();
 
     const data = await response.json() as GoogleCalendarEvent;
     const event = this.parseEvent(data, calId);
@@ -625,6 +713,7 @@ export class CalendarSkill {
       const error = await response.text();
       throw new Error(`Failed to update event: ${error}`);
     }
+    this.invalidateResponseCache();
 
     const data = await response.json() as GoogleCalendarEvent;
     const event = this.parseEvent(data, calId);
@@ -656,6 +745,7 @@ export class CalendarSkill {
     if (!response.ok) {
       throw new Error(`Failed to delete event: ${response.statusText}`);
     }
+    this.invalidateResponseCache();
 
     // Remove from cache
     if (this.enableCache && this.db) {
@@ -675,41 +765,13 @@ export class CalendarSkill {
     const timeMax = new Date(options.timeMax).toISOString();
     const durationMs = options.duration * 60 * 1000;
 
-    const requestBody = {
+    const busyPeriods = await this.queryBusyPeriods(
+      calendars,
       timeMin,
       timeMax,
-      timeZone: options.timeZone || Intl.DateTimeFormat().resolvedOptions().timeZone,
-      items: calendars.map(id => ({ id })),
-    };
-
-    const response = await this.googleClient.fetch(
-      `${CALENDAR_API_BASE}/freeBusy`,
-      {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify(requestBody),
-      }
+      options.timeZone || Intl.DateTimeFormat().resolvedOptions().timeZone
     );
 
-    if (!response.ok) {
-      throw new Error(`Failed to query free/busy: ${response.statusText}`);
-    }
-
-    const data = await response.json() as GoogleFreeBusyResponse;
-
-    // Collect all busy periods
-    const busyPeriods: TimeSlot[] = [];
-    for (const cal of Object.values(data.calendars || {})) {
-      for (const busy of cal.busy || []) {
-        busyPeriods.push({
-          start: busy.start,
-          end: busy.end,
-        });
-      }
-    }
-
     // Sort by start time
     busyPeriods.sort((a, b) => new Date(a.start).getTime() - new Date(b.start).getTime());
 
@@ -845,6 +907,84 @@ export class CalendarSkill {
 
   // Private helper methods
 
+  /**
+   * Busy periods for the given calendars, clipped to [timeMin, timeMax].
+   * The underlying freeBusy query covers the enclosing whole weeks and is
+   * reused for RESPONSE_CACHE_TTL_MS, so slicing a week day by day costs a
+   * single API call.
+   */
+  private async queryBusyPeriods(
+    calendars: string[],
+    timeMin: string,
+    timeMax: string,
+    timeZone: string
+  ): Promise<TimeSlot[]> {
+    const minMs = new Date(timeMin).getTime();
+    const maxMs = new Date(timeMax).getTime();
+    const windowStart = Math.floor(minMs / WEEK_MS) * WEEK_MS;
+    const windowEnd = Math.ceil(maxMs / WEEK_MS) * WEEK_MS;
+
+    const key = `${[...calendars].sort().join(',')}|${windowStart}|${windowEnd}`;
+    let entry = this.freeBusyCache.get(key);
+
+    if (!entry || Date.now() - entry.fetchedAt >= RESPONSE_CACHE_TTL_MS) {
+      const requestBody = {
+        timeMin: new Date(windowStart).toISOString(),
+        timeMax: new Date(windowEnd).toISOString(),
+        timeZone,
+        items: calendars.map(id => ({ id })),
+      };
+
+      const response = await this.googleClient.fetch(
+        `${CALENDAR_API_BASE}/freeBusy`,
+        {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          body: JSON.stringify(requestBody),
+        }
+      );
+
+      if (!response.ok) {
+        throw new Error(`Failed to query free/busy: ${response.statusText}`);
+      }
+
+      const data = await response.json() as GoogleFreeBusyResponse;
+
+      const busy: TimeSlot[] = [];
+      for (const cal of Object.values(data.calendars || {})) {
+        for (const period of cal.busy || []) {
+          busy.push({ start: period.start, end: period.end });
+        }
+      }
+
+      entry = { fetchedAt: Date.now(), busy };
+      cacheResponse(this.freeBusyCache, key, entry);
+    }
+
+    // Clip the cached week(s) to the requested window
+    const busyPeriods: TimeSlot[] = [];
+    for (const period of entry.busy) {
+      const start = new Date(period.start).getTime();
+      const end = new Date(period.end).getTime();
+      if (end <= minMs || start >= maxMs) continue;
+      busyPeriods.push({
+        start: new Date(Math.max(start, minMs)).toISOString(),
+        end: new Date(Math.min(end, maxMs)).toISOString(),
+      });
+    }
+    return busyPeriods;
+  }
+
+  /**
+   * Drop cached free/busy and event list responses after a write
+   */
+  private invalidateResponseCache(): void {
+    this.freeBusyCache.clear();
+    this.eventsCache.clear();
+  }
+
   private async ensureConnected(): Promise<void> {
     const status = await this.getStatus();
     if (!status.connected) {
@@ -397,9 +397,9 @@ export class DataConnectorSkill {
   // ==================== Google Sheets ====================
 
   /**
-   * Read data from Google Sheets
+   * Get an access token for the Sheets API
    */
-  async readGoogleSheets(config: GoogleSheetsConfig): Promise<Row[]> {
+  private async getGoogleSheetsToken(): Promise<string> {
     const google = await this.loadGoogleOAuth();
     const auth = new google.GoogleOAuthClient();
     
@@ -412,11 +412,39 @@ export class DataConnectorSkill {
       throw new Error('Failed to get access token');
     }
     
-    const sheetName = config.sheetName || 'Sheet1';
-    const range = config.range || `${sheetName}!A1:Z1000`;
+    return token;
+  }
+
+  /**
+   * Read data from Google Sheets
+   */
+  async readGoogleSheets(config: GoogleSheetsConfig): Promise<Row[]> {
+    const [rows] = await this.readGoogleSheetsBatch(config.spreadsheetId, [config]);
+    return rows;
+  }
+
+  /**
+   * Read several ranges of one spreadsheet with a single values:batchGet call.
+   * Returns one row array per config, in the same order.
+   */
+  async readGoogleSheetsBatch(
+    spreadsheetId: string,
+    configs: Array<Omit<GoogleSheetsConfig, 'spreadsheetId'>>
+  ): Promise<Row[][]> {
+    const token = await this.getGoogleSheetsToken();
+    
+    if (configs.length === 0) {
+      return [];
+    }
+    
+    const params = new URLSearchParams();
+    for (const config of configs) {
+      const sheetName = config.sheetName || 'Sheet1';
+      params.append('ranges', config.range || `${sheetName}!A1:Z1000`);
+    }
     
     const response = await fetch(
-      `https://sheets.googleapis.com/v4/spreadsheets/${config.spreadsheetId}/values/${encodeURIComponent(range)}`,
+      `https://sheets.googleapis.com/v4/spreadsheets/${spreadsheetId}/values:batchGet?${params.toString()}`,
       {
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -430,24 +458,31 @@ export class DataConnectorSkill {
       throw new Error(`Google Sheets API error: ${response.status} - ${error}`);
     }
     
-    const data = await response.json() as { values?: string[][] };
+    const data = await response.json() as { valueRanges?: Array<{ values?: string[][] }> };
+    const valueRanges = data.valueRanges || [];
     
-    if (!data.values || data.values.length === 0) {
+    return configs.map((config, i) =>
+      this.sheetValuesToRows(valueRanges[i]?.values, config.hasHeaderRow !== false)
+    );
+  }
+
+  /**
+   * Convert a Sheets values grid into row objects
+   */
+  private sheetValuesToRows(values: string[][] | undefined, hasHeader: boolean): Row[] {
+    if (!values || values.length === 0) {
       return [];
     }
     
-    const hasHeader = config.hasHeaderRow !== false;
-    const rows = data.values;
-    
     if (!hasHeader) {
-      return rows.map((row, index) => ({
+      return values.map((row, index) => ({
         _rowIndex: index + 1,
         ...row.reduce((obj, val, i) => ({ ...obj, [`col${i + 1}`]: val }), {})
       }));
     }
     
-    const headers = rows[0];
-    return rows.slice(1).map((row, index) => {
+    const headers = values[0];
+    return values.slice(1).map((row, index) => {
       const obj: Row = { _rowIndex: index + 2 };
       headers.forEach((header, i) => {
         obj[header] = row[i] || '';
@@ -460,42 +495,43 @@ export class DataConnectorSkill {
    * Write data to Google Sheets
    */
   async writeGoogleSheets(config: GoogleSheetsConfig, data: Row[]): Promise<void> {
-    const google = await this.loadGoogleOAuth();
-    const auth = new google.GoogleOAuthClient();
-    
-    if (!(await auth.isConnected())) {
-      throw new Error('Google OAuth not connected. Run: google-oauth connect sheets');
-    }
-    
-    const token = await auth.getAccessToken();
-    if (!token) {
-      throw new Error('Failed to get access token');
-    }
+    await this.writeGoogleSheetsBatch(config.spreadsheetId, [{ sheetName: config.sheetName, data }]);
+  }
+
+  /**
+   * Write several sheets of one spreadsheet with a single values:batchUpdate call.
+   * Each entry is written from A1 with a header row, like writeGoogleSheets.
+   */
+  async writeGoogleSheetsBatch(
+    spreadsheetId: string,
+    writes: Array<{ sheetName?: string; data: Row[] }>
+  ): Promise<void> {
+    const token = await this.getGoogleSheetsToken();
     
-    if (data.length === 0) {
+    if (writes.length === 0 || writes.some(w => w.data.length === 0)) {
       throw new Error('No data to write');
     }
     
-    // Extract headers from first row (excluding internal _rowIndex)
-    const firstRow = data[0];
-    const headers = Object.keys(firstRow).filter(k => !k.startsWith('_'));
-    
-    // Convert data to array format
-    const values = data.map(row => headers.map(h => String(row[h] || '')));
-    values.unshift(headers); // Add header row
-    
-    const sheetName = config.sheetName || 'Sheet1';
-    const range = `${sheetName}!A1`;
+    const ranges = writes.map(({ sheetName, data }) => {
+      // Extract headers from first row (excluding internal _rowIndex)
+      const headers = Object.keys(data[0]).filter(k => !k.startsWith('_'));
+      
+      // Convert data to array format
+      const values = data.map(row => headers.map(h => String(row[h] || '')));
+      values.unshift(headers); // Add header row
+      
+      return { range: `${sheetName || 'Sheet1'}!A1`, values };
+    });
     
     const response = await fetch(
-      `https://sheets.googleapis.com/v4/spreadsheets/${config.spreadsheetId}/values/${encodeURIComponent(range)}?valueInputOption=RAW`,
+      `https://sheets.googleapis.com/v4/spreadsheets/${spreadsheetId}/values:batchUpdate`,
       {
-        method: 'PUT',
+        method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
         },
-        body: JSON.stringify({ values })
+        body: JSON.stringify({ valueInputOption: 'RAW', data: ranges })
       }
     );
     
@@ -509,17 +545,7 @@ export class DataConnectorSkill {
    * Append data to Google Sheets
    */
   async appendGoogleSheets(config: GoogleSheetsConfig, data: Row[]): Promise<void> {
-    const google = await this.loadGoogleOAuth();
-    const auth = new google.GoogleOAuthClient();
-    
-    if (!(await auth.isConnected())) {
-      throw new Error('Google OAuth not connected. Run: google-oauth connect sheets');
-    }
-    
-    const token = await auth.getAccessToken();
-    if (!token) {
-      throw new Error('Failed to get access token');
-    }
+    const token = await this.getGoogleSheetsToken();
     
     if (data.length === 0) {
       return;
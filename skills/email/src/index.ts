@@ -10,8 +10,26 @@ import path from 'path';
 import os from 'os';
 import fs from 'fs';
 
-// Gmail API base URL
+// Gmail API base URLs
 const GMAIL_API_BASE = 'https://gmail.googleapis.com/gmail/v1';
+const GMAIL_UPLOAD_BASE = 'https://gmail.googleapis.com/upload/gmail/v1';
+
+// Maximum number of in-flight message requests when fetching in bulk
+const METADATA_FETCH_CONCURRENCY = 10;
+
+// Page size used when iterating over large result sets
+const LIST_PAGE_SIZE = 100;
+
+// Partial-response field mask for attachment listing. Gmail field masks
+// cannot recurse, so nested multiparts are spelled out a few levels deep.
+const ATTACHMENT_PART_FIELDS = (() => {
+  const leaf = 'filename,mimeType,body(attachmentId,size)';
+  let fields = leaf;
+  for (let depth = 0; depth < 4; depth++) {
+    fields = `${leaf},parts(${fields})`;
+  }
+  return fields;
+})();
 
 /**
  * Email metadata structure
@@ -311,15 +329,7 @@ export class EmailSkill {
     }
 
     // Get metadata for each message
-    const emails: EmailMetadata[] = [];
-    for (const msg of data.messages) {
-      try {
-        const metadata = await this.getEmailMetadata(msg.id);
-        emails.push(metadata);
-      } catch (error) {
-        console.warn(`Failed to get metadata for ${msg.id}:`, error);
-      }
-    }
+    const emails = await this.getEmailMetadataBatch(data.messages.map(m => m.id));
 
     // Cache the results
     if (this.enableCache && this.db) {
@@ -334,6 +344,38 @@ export class EmailSkill {
     };
   }
 
+  /**
+   * Iterate over emails across result pages, up to maxResults in total.
+   * Pages are requested lazily, so breaking out of the loop early avoids
+   * fetching the remaining pages.
+   */
+  async *iterate(options: {
+    maxResults?: number;
+    labelIds?: string[];
+    query?: string;
+  } = {}): AsyncGenerator<EmailMetadata> {
+    const maxResults = options.maxResults || 100;
+    let pageToken: string | undefined;
+    let seen = 0;
+
+    while (seen < maxResults) {
+      const page = await this.list({
+        maxResults: Math.min(maxResults - seen, LIST_PAGE_SIZE),
+        pageToken,
+        labelIds: options.labelIds,
+        query: options.query,
+      });
+
+      for (const email of page.emails) {
+        yield email;
+        if (++seen >= maxResults) return;
+      }
+
+      if (!page.nextPageToken) return;
+      pageToken = page.nextPageToken;
+    }
+  }
+
   /**
    * Search emails with Gmail query syntax
    */
@@ -349,17 +391,32 @@ export class EmailSkill {
    */
   async getEmailMetadata(messageId: string): Promise<EmailMetadata> {
     await this.ensureConnected();
+    return this.fetchEmailMetadata(messageId);
+  }
 
-    const response = await this.googleClient.fetch(
-      `${GMAIL_API_BASE}/me/messages/${messageId}?format=metadata&metadataHeaders=Subject&metadataHeaders=From&metadataHeaders=To&metadataHeaders=Cc&metadataHeaders=Bcc&metadataHeaders=Date`
-    );
+  /**
+   * Get metadata for many messages, issuing up to METADATA_FETCH_CONCURRENCY
+   * requests at a time instead of one round trip after another.
+   * Messages that fail to load are skipped; order follows messageIds.
+   */
+  async getEmailMetadataBatch(messageIds: string[]): Promise<EmailMetadata[]> {
+    await this.ensureConnected();
 
-    if (!response.ok) {
-      throw new Error(`Failed to get email metadata: ${response.statusText}`);
+    const emails: EmailMetadata[] = [];
+    for (let i = 0; i < messageIds.length; i += METADATA_FETCH_CONCURRENCY) {
+      const chunk = messageIds.slice(i, i + METADATA_FETCH_CONCURRENCY);
+      const results = await Promise.allSettled(chunk.map(id => this.fetchEmailMetadata(id)));
+
+      results.forEach((result, j) => {
+        if (result.status === 'fulfilled') {
+          emails.push(result.value);
+        } else {
+          console.warn(`Failed to get metadata for ${chunk[j]}:`, result.reason);
+        }
+      });
     }
 
-    const data = await response.json() as GmailMessage;
-    return this.parseEmailMetadata(data);
+    return emails;
   }
 
   /**
@@ -410,21 +467,25 @@ export class EmailSkill {
     await this.ensureConnected();
 
     const raw = this.buildRawMessage(options);
-    const encoded = this.base64UrlEncode(raw);
 
-    const response = await this.googleClient.fetch(
-      `${GMAIL_API_BASE}/me/messages/send`,
-      {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          raw: encoded,
-          threadId: options.threadId,
-        }),
-      }
-    );
+    // Messages with attachments go through the upload endpoint as-is, which
+    // avoids re-encoding the whole (already base64) MIME body as base64url
+    // JSON and the extra copies that come with it.
+    const response = options.attachments?.length
+      ? await this.uploadRawMessage(raw, options.threadId)
+      : await this.googleClient.fetch(
+          `${GMAIL_API_BASE}/me/messages/send`,
+          {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+              raw: this.base64UrlEncode(raw),
+              threadId: options.threadId,
+            }),
+          }
+        );
 
     if (!response.ok) {
       const error = await response.text();
@@ -585,6 +646,31 @@ export class EmailSkill {
     return Buffer.from(data.data, 'base64url');
   }
 
+  /**
+   * List a message's attachments without downloading its bodies.
+   * Uses a partial response that keeps only part names, types and
+   * attachment ids, so large inline bodies never cross the wire.
+   */
+  async listAttachments(messageId: string): Promise<Attachment[]> {
+    await this.ensureConnected();
+
+    const params = new URLSearchParams({
+      format: 'full',
+      fields: `payload(${ATTACHMENT_PART_FIELDS})`,
+    });
+
+    const response = await this.googleClient.fetch(
+      `${GMAIL_API_BASE}/me/messages/${messageId}?${params.toString()}`
+    );
+
+    if (!response.ok) {
+      throw new Error(`Failed to list attachments: ${response.statusText}`);
+    }
+
+    const data = await response.json() as { payload?: GmailPayload };
+    return this.extractParts(data.payload).attachments;
+  }
+
   /**
    * List labels
    */
@@ -674,6 +760,19 @@ export class EmailSkill {
     }
   }
 
+  private async fetchEmailMetadata(messageId: string): Promise<EmailMetadata> {
+    const response = await this.googleClient.fetch(
+      `${GMAIL_API_BASE}/me/messages/${messageId}?format=metadata&metadataHeaders=Subject&metadataHeaders=From&metadataHeaders=To&metadataHeaders=Cc&metadataHeaders=Bcc&metadataHeaders=Date`
+    );
+
+    if (!response.ok) {
+      throw new Error(`Failed to get email metadata: ${response.statusText}`);
+    }
+
+    const data = await response.json() as GmailMessage;
+    return this.parseEmailMetadata(data);
+  }
+
   private parseEmailMetadata(data: GmailMessage): EmailMetadata {
     const headers = data.payload?.headers || [];
     const getHeader = (name: string) => 
@@ -728,39 +827,56 @@ export class EmailSkill {
 
     if (!payload) return result;
 
-    // If it's a simple message
-    if (payload.body?.data) {
-      const content = this.decodeBase64Url(payload.body.data);
-      if (payload.mimeType === 'text/plain') {
-        result.text = content;
-      } else if (payload.mimeType === 'text/html') {
-        result.html = content;
+    // Walk the MIME tree with an explicit stack of frames instead of recursing
+    // per nested multipart. Each frame collects its own result exactly as the
+    // recursive version did: direct text/html children overwrite, and a nested
+    // multipart only fills text/html its parent has not found yet.
+    type Frame = { part: GmailPayload; index: number; result: typeof result };
+    const openFrame = (part: GmailPayload, into: typeof result): Frame => {
+      if (part.body?.data) {
+        const content = this.decodeBase64Url(part.body.data);
+        if (part.mimeType === 'text/plain') {
+          into.text = content;
+        } else if (part.mimeType === 'text/html') {
+          into.html = content;
+        }
       }
-    }
+      return { part, index: 0, result: into };
+    };
 
-    // If it has parts (multipart)
-    if (payload.parts) {
-      for (const part of payload.parts) {
-        if (part.mimeType === 'text/plain' && part.body?.data) {
-          result.text = this.decodeBase64Url(part.body.data);
-        } else if (part.mimeType === 'text/html' && part.body?.data) {
-          result.html = this.decodeBase64Url(part.body.data);
-        } else if (part.filename && part.body?.attachmentId) {
-          result.attachments.push({
-            id: part.body.attachmentId,
-            filename: part.filename,
-            mimeType: part.mimeType || 'application/octet-stream',
-            size: part.body.size || 0,
-          });
-        }
-        
-        // Recursively handle nested parts
-        if (part.parts) {
-          const nested = this.extractParts(part);
-          if (!result.text && nested.text) result.text = nested.text;
-          if (!result.html && nested.html) result.html = nested.html;
-          result.attachments.push(...nested.attachments);
+    const stack: Frame[] = [openFrame(payload, result)];
+    while (stack.length > 0) {
+      const frame = stack[stack.length - 1];
+      const parts = frame.part.parts || [];
+
+      if (frame.index >= parts.length) {
+        stack.pop();
+        const parent = stack[stack.length - 1];
+        if (parent) {
+          const nested = frame.result;
+          if (!parent.result.text && nested.text) parent.result.text = nested.text;
+          if (!parent.result.html && nested.html) parent.result.html = nested.html;
+          parent.result.attachments.push(...nested.attachments);
         }
+        continue;
+      }
+
+      const part = parts[frame.index++];
+      if (part.mimeType === 'text/plain' && part.body?.data) {
+        frame.result.text = this.decodeBase64Url(part.body.data);
+      } else if (part.mimeType === 'text/html' && part.body?.data) {
+        frame.result.html = this.decodeBase64Url(part.body.data);
+      } else if (part.filename && part.body?.attachmentId) {
+        frame.result.attachments.push({
+          id: part.body.attachmentId,
+          filename: part.filename,
+          mimeType: part.mimeType || 'application/octet-stream',
+          size: part.body.size || 0,
+        });
+      }
+
+      if (part.parts) {
+        stack.push(openFrame(part, { text: '', html: '', attachments: [] }));
       }
     }
 
@@ -846,6 +962,32 @@ export class EmailSkill {
     return lines.join('\r\n');
   }
 
+  private async uploadRawMessage(raw: string, threadId?: string): Promise<Response> {
+    const boundary = `----=_Upload_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+    const metadata = JSON.stringify(threadId ? { threadId } : {});
+
+    const body = new Blob([
+      `--${boundary}\r\n`,
+      'Content-Type: application/json; charset=UTF-8\r\n\r\n',
+      `${metadata}\r\n`,
+      `--${boundary}\r\n`,
+      'Content-Type: message/rfc822\r\n\r\n',
+      raw,
+      `\r\n--${boundary}--`,
+    ]);
+
+    return this.googleClient.fetch(
+      `${GMAIL_UPLOAD_BASE}/me/messages/send?uploadType=multipart`,
+      {
+        method: 'POST',
+        headers: {
+          'Content-Type': `multipart/related; boundary=${boundary}`,
+        },
+        body,
+      }
+    );
+  }
+
   private async cacheEmails(emails: EmailMetadata[]): Promise<void> {
     if (!this.db) return;
 
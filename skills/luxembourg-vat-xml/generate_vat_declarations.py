@@ -4,9 +4,11 @@ Generate Luxembourg quarterly VAT declarations (TVA_DECT) in eCDF XML format
 """
 
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 import csv
+import functools
 import json
 import os
 import sys
@@ -19,8 +21,17 @@ def load_config(config_path='vat_config.json'):
         print("Please copy vat_config.example.json to vat_config.json and fill in your details")
         sys.exit(1)
     
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    # orjson parses noticeably faster when installed; the stdlib is the fallback
+    try:
+        import orjson
+    except ImportError:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+    else:
+        with open(config_path, 'rb') as f:
+            config = orjson.loads(f.read())
+    
+    return config
 
 # Default config (will be overridden by file)
 CONFIG = {
@@ -37,98 +48,179 @@ CONFIG = {
     "output_directory": "./output"
 }
 
+# Amounts are kept as Decimal and rounded half-up to cents
+ZERO = Decimal('0')
+CENTS = Decimal('0.01')
+D117 = Decimal('1.17')
+D017 = Decimal('0.17')
+
+def to_cents(value):
+    """Round a Decimal amount half-up to two decimals"""
+    return value.quantize(CENTS, ROUND_HALF_UP)
+
 def parse_amount(amount_str):
-    """Parse amount string to float"""
+    """Parse amount string to Decimal"""
     if not amount_str or amount_str == "":
-        return 0.0
+        return ZERO
     try:
-        return float(str(amount_str).replace(',', '.').replace(' ', ''))
-    except:
-        return 0.0
+        return Decimal(str(amount_str).replace(',', '.').replace(' ', '') or '0')
+    except InvalidOperation:
+        return ZERO
 
+_ZERO_FORMATTED = '0,00'
+
+@functools.lru_cache(maxsize=4096)
 def format_ecdf_number(value):
     """Format number with comma as decimal separator"""
-    return f"{value:.2f}".replace('.', ',')
+    if value == 0:
+        return _ZERO_FORMATTED
+    return str(to_cents(Decimal(value))).replace('.', ',')
+
+# NumericField ids written before and after the Choice/end fields block
+_FIRST_BATCH_IDS = (
+    '012', '021', '457', '014', '018', '423', '419', '022', '037',
+    '033', '046', '051', '056', '152', '065', '407', '409', '436',
+    '463', '765', '410', '462', '464', '766', '741', '742', '751',
+    '752', '951', '952', '753', '754', '953', '954', '755', '756',
+    '955', '956', '441', '442', '445', '767', '768', '076', '458',
+    '459', '460', '090', '461', '092', '228', '093', '097', '102',
+    '103', '104', '105',
+)
+_FINAL_BATCH_IDS = ('042', '416', '417', '451', '452')
 
-def calculate_quarter(quarter, config):
-    """Calculate VAT fields for a specific quarter"""
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+def prepare_providers(config):
+    """Precompute provider lookups used for every CSV row
     
-    csv_file = config.get('csv_file', 'expenses.csv')
+    Returns (non_eu_set, eu_divisors): a frozenset of non-EU providers and a
+    dict mapping each EU provider to 1 + its VAT rate, as Decimal. The config
+    itself is left untouched.
+    """
     providers = config.get('provider_categories', {})
-    usd_to_eur = config.get('vat_settings', {}).get('usd_to_eur_rate', 0.923)
+    non_eu_set = frozenset(providers.get('non_eu_services', []))
+    eu_divisors = {
+        provider: 1 + Decimal(str(settings.get('vat_rate', 0.20)))
+        for provider, settings in providers.get('eu_services', {}).items()
+    }
+    return non_eu_set, eu_divisors
+
+# Positions of the per-quarter running totals built by bucket_rows()
+NON_EU_BASE, NON_EU_VAT, EU_BASE, EU_VAT, LU_VAT = range(5)
+
+def bucket_rows(config, providers=None):
+    """Read the expenses CSV once and total each quarter's VAT bases
+    
+    Returns a dict mapping quarter to a list of
+    [field_751, field_752, field_741, field_742, field_458] sums.
+    Exempt rows and Luxembourg rows without VAT add nothing.
+    Pass the result of prepare_providers() as providers to reuse it.
+    """
+    csv_file = config.get('csv_file', 'expenses.csv')
+    if providers is None:
+        providers = prepare_providers(config)
+    non_eu_providers, eu_divisors = providers
+    usd_to_eur = Decimal(str(config.get('vat_settings', {}).get('usd_to_eur_rate', 0.923)))
     
     # Check if CSV exists
     if not os.path.exists(csv_file):
         print(f"WARNING: CSV file not found: {csv_file}")
-        print("Creating declaration with zero values")
-        csv_file = None
-    
-    # Initialize counters
-    field_458 = 0.0  # Luxembourg VAT (direct deduction)
-    field_751 = 0.0  # Non-EU base at 17%
-    field_752 = 0.0  # Non-EU VAT at 17%
-    field_741 = 0.0  # EU base at 17%
-    field_742 = 0.0  # EU VAT at 17%
-    
-    if csv_file:
-        non_eu_providers = providers.get('non_eu_services', [])
-        eu_providers = providers.get('eu_services', {})
+        print("Creating declarations with zero values")
+        return {}
+    
+    buckets = {}
+    
+    with open(csv_file, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
         
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('Quarter') != quarter:
-                    continue
-                    
-                provider = row.get('Provider', '')
-                vat_rate = row.get('VAT Rate', '').replace('%', '')
-                total = parse_amount(row.get('Total Amount (EUR)', '0'))
-                currency = row.get('Currency', 'EUR')
-                vat_amount = parse_amount(row.get('VAT Amount', '0'))
-                notes = row.get('Notes', '')
-                
-                # Skip rent items (exempt)
-                if 'Rent' in notes:
-                    continue
-                
-                # Convert USD to EUR
-                if currency == 'USD':
-                    total = total * usd_to_eur
+        # Resolve column positions once; a missing column points at the
+        # blank padding cell appended to every row
+        columns = {name: i for i, name in enumerate(header)}
+        blank = len(header)
+        width = blank + 1
+        provider_col = columns.get('Provider', blank)
+        total_col = columns.get('Total Amount (EUR)', blank)
+        currency_col = columns.get('Currency', blank)
+        vat_col = columns.get('VAT Amount', blank)
+        notes_col = columns.get('Notes', blank)
+        quarter_col = columns.get('Quarter', blank)
+        net_col = columns.get('Net Amount', blank)
+        
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend([''] * (width - len(row)))
+            
+            provider = row[provider_col]
+            total = parse_amount(row[total_col])
+            currency = row[currency_col]
+            vat_amount = parse_amount(row[vat_col])
+            notes = row[notes_col]
+            
+            # Skip rent items (exempt)
+            if 'Rent' in notes:
+                continue
+            
+            # Convert USD to EUR
+            if currency == 'USD':
+                total = total * usd_to_eur
+            
+            quarter = row[quarter_col]
+            totals = buckets.get(quarter)
+            if totals is None:
+                totals = buckets[quarter] = [ZERO] * 5
+            
+            # Categorize by provider type
+            if provider in non_eu_providers:
+                # Non-EU services - reverse charge at 17%
+                base = total / D117
+                totals[NON_EU_BASE] += base
+                totals[NON_EU_VAT] += base * D017
                 
-                # Categorize by provider type
-                if provider in non_eu_providers:
-                    # Non-EU services - reverse charge at 17%
-                    base = total / 1.17
-                    vat = base * 0.17
-                    field_751 += base
-                    field_752 += vat
-                    
-                elif provider in eu_providers:
-                    # EU services - reverse charge at 17%
-                    net_amount = parse_amount(row.get('Net Amount', '0'))
-                    if net_amount > 0:
-                        base = net_amount
-                    else:
-                        # Fallback: calculate from total
-                        eu_vat_rate = eu_providers[provider].get('vat_rate', 0.20)
-                        base = total / (1 + eu_vat_rate)
-                    vat_lu = base * 0.17
-                    field_741 += base
-                    field_742 += vat_lu
-                    
+            elif provider in eu_divisors:
+                # EU services - reverse charge at 17%
+                net_amount = parse_amount(row[net_col])
+                if net_amount > 0:
+                    base = net_amount
                 else:
-                    # Luxembourg suppliers - direct VAT deduction
-                    if vat_amount > 0:
-                        field_458 += vat_amount
+                    # Fallback: calculate from total
+                    base = total / eu_divisors[provider]
+                totals[EU_BASE] += base
+                totals[EU_VAT] += base * D017
+                
+            elif vat_amount > 0:
+                # Luxembourg suppliers - direct VAT deduction
+                totals[LU_VAT] += vat_amount
     
-    # Calculate derived fields (use rounded values to avoid validation errors)
+    return buckets
+
+def calculate_quarter(quarter, config, buckets=None):
+    """Calculate VAT fields for a specific quarter
+    
+    Pass the result of bucket_rows() as buckets to avoid re-reading the
+    CSV when several quarters are calculated in a row.
+    """
+    if buckets is None:
+        buckets = bucket_rows(config)
+    
+    # Round the totals once so every derived field adds up exactly to the cent
+    totals = [to_cents(total) for total in buckets.get(quarter, [ZERO] * 5)]
+    field_751 = totals[NON_EU_BASE]  # Non-EU base at 17%
+    field_752 = totals[NON_EU_VAT]   # Non-EU VAT at 17%
+    field_741 = totals[EU_BASE]      # EU base at 17%
+    field_742 = totals[EU_VAT]       # EU VAT at 17%
+    field_458 = totals[LU_VAT]       # Luxembourg VAT (direct deduction)
+    
+    # Calculate derived fields
     field_463 = field_751
     field_464 = field_752
     field_436 = field_741
     field_462 = field_742
     field_461 = field_464 + field_462
-    field_409 = round(field_436, 2) + round(field_463, 2)
-    field_410 = round(field_462, 2) + round(field_464, 2)
+    field_409 = field_436 + field_463
+    field_410 = field_462 + field_464
     field_093 = field_458 + field_461
     field_076 = field_410
     field_102 = field_093
@@ -172,7 +264,7 @@ def calculate_quarter(quarter, config):
         '042': 0.0, '416': 0.0, '417': 0.0, '451': 0.0, '452': 0.0,
     }
 
-def generate_xml(quarter, config, year=2024):
+def generate_xml(quarter, config, year=2024, buckets=None):
     """Generate eCDF XML for a specific quarter"""
     
     company = config['company']
@@ -181,7 +273,7 @@ def generate_xml(quarter, config, year=2024):
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    fields = calculate_quarter(quarter, config)
+    fields = calculate_quarter(quarter, config, buckets)
     period = {'Q1': 1, 'Q2': 2, 'Q3': 3, 'Q4': 4}[quarter]
     
     now = datetime.now()
@@ -217,15 +309,7 @@ def generate_xml(quarter, config, year=2024):
     
     formdata = ET.SubElement(declaration, "FormData")
     
-    first_batch_ids = ['012', '021', '457', '014', '018', '423', '419', '022', '037', 
-                       '033', '046', '051', '056', '152', '065', '407', '409', '436', 
-                       '463', '765', '410', '462', '464', '766', '741', '742', '751', 
-                       '752', '951', '952', '753', '754', '953', '954', '755', '756', 
-                       '955', '956', '441', '442', '445', '767', '768', '076', '458', 
-                       '459', '460', '090', '461', '092', '228', '093', '097', '102', 
-                       '103', '104', '105']
-    
-    for field_id in first_batch_ids:
+    for field_id in _FIRST_BATCH_IDS:
         value = fields.get(field_id, 0.0)
         nf = ET.SubElement(formdata, "NumericField")
         nf.set("id", field_id)
@@ -243,24 +327,20 @@ def generate_xml(quarter, config, year=2024):
         nf.set("id", field_id)
         nf.text = str(value)
     
-    final_batch_ids = ['042', '416', '417', '451', '452']
-    for field_id in final_batch_ids:
+    for field_id in _FINAL_BATCH_IDS:
         value = fields.get(field_id, 0.0)
         nf = ET.SubElement(formdata, "NumericField")
         nf.set("id", field_id)
         nf.text = format_ecdf_number(value)
     
-    rough_string = ET.tostring(root, encoding='unicode')
-    reparsed = minidom.parseString(rough_string)
-    xml_str = reparsed.toprettyxml(indent="    ", encoding="UTF-8").decode('utf-8')
-    
-    lines = [line for line in xml_str.split('\n') if line.strip()]
-    xml_str = '\n'.join(lines)
+    ET.indent(root, space="    ")
+    xml_str = '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(root, encoding='unicode')
     
     filename = f"{company['eCDFPrefix']}{timestamp}{period:02d}.xml"
     filepath = os.path.join(output_dir, filename)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
+    # A 1 MiB buffer lets the whole declaration go out in a single write()
+    with open(filepath, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
         f.write(xml_str)
     
     return filename, fields
@@ -287,6 +367,7 @@ def print_summary(quarter, fields):
 if __name__ == "__main__":
     # Load configuration
     config = load_config()
+    providers = prepare_providers(config)
     company_name = config.get('company', {}).get('name', 'Your Company')
     
     print("\n" + "="*60)
@@ -294,10 +375,19 @@ if __name__ == "__main__":
     print(f"  {company_name}")
     print("="*60)
     
-    for quarter in ['Q1', 'Q2', 'Q3', 'Q4']:
-        filename, fields = generate_xml(quarter, config)
-        print_summary(quarter, fields)
-        print(f"  Generated: {filename}")
+    buckets = bucket_rows(config, providers)
+    
+    # Quarters are independent once the CSV is bucketed, so build and write
+    # them concurrently and print the summaries in quarter order afterwards
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            quarter: executor.submit(generate_xml, quarter, config, buckets=buckets)
+            for quarter in ['Q1', 'Q2', 'Q3', 'Q4']
+        }
+        for quarter, future in futures.items():
+            filename, fields = future.result()
+            print_summary(quarter, fields)
+            print(f"  Generated: {filename}")
     
     print("\n" + "="*60)
     print("  ALL 4 QUARTERLY DECLARATIONS GENERATED")
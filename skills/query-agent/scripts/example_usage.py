@@ -2,7 +2,7 @@
 """Example: Agent using the query-agent skill."""
 
 import os
-from query_agent import query, discover_schema
+from query_agent import query, query_batch, discover_schema
 
 
 def example_basic_query():
@@ -180,21 +180,25 @@ def example_batch_queries():
         "Average order value trend",
     ]
     
-    results = []
-    for i, question in enumerate(questions, 1):
+    if not os.environ["LLM_API_KEY"]:
+        print("(Set OPENAI_API_KEY to run)")
+        return
+    
+    # Questions run concurrently; results come back in question order
+    results = query_batch(
+        questions,
+        concurrency=4,
+        storage_paths=[f"reports/daily_report_{i}" for i in range(1, len(questions) + 1)]
+    )
+    for i, (question, result) in enumerate(zip(questions, results), 1):
         print(f"\nQuery {i}: {question}")
-        # result = query(
-        #     question=question,
-        #     storage_path=f"reports/daily_report_{i}"
-        # )
-        # results.append(result)
-        # print(f"  ✓ {result['row_count']} rows")
-        # print(f"  ✓ {result['summary'][:60]}...")
-    
-    print("\n(No queries configured - uncomment to run)")
-    
-    if results:
-        print(f"\nCompleted {len(results)} queries")
+        if not result["success"]:
+            print(f"  ✗ {result['error']}")
+            continue
+        print(f"  ✓ {result['row_count']} rows")
+        print(f"  ✓ {result['summary'][:60]}...")
+    
+    print(f"\nCompleted {len(results)} queries")
 
 
 def example_sqlite_local():
@@ -17,24 +17,85 @@ Environment:
     STORAGE_TYPE, STORAGE_* (per storage type)
 """
 
+import decimal
+import functools
+import hashlib
+import io
 import json
 import logging
 import os
+import queue
 import re
 import ssl
+import string
 import sys
 import tempfile
-import xml.etree.ElementTree as ET
-from datetime import datetime
+import threading
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, time as dt_time
 from pathlib import Path
 from typing import Any, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is used on the LLM path when installed; stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to a JSON string, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, with orjson when available.
+    
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    catch the stdlib exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Shared keep-alive session for LLM calls, so SQL generation and
+# summarization reuse the same TCP/TLS connection. Rate limits and
+# transient server errors are retried with backoff. Read errors are not
+# retried, since the completion may already be running server-side, and
+# once retries run out the last response is returned so raise_for_status()
+# reports the real status instead of a RetryError.
+_LLM_ADAPTER = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        connect=2,
+        read=False,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False
+    )
+)
+_LLM_SESSION = requests.Session()
+_LLM_SESSION.headers.update({"Content-Type": "application/json"})
+_LLM_SESSION.mount("http://", _LLM_ADAPTER)
+_LLM_SESSION.mount("https://", _LLM_ADAPTER)
+
 
 # ============================================================================
 # Environment Configuration
@@ -124,6 +185,16 @@ class DatabaseConnection:
         else:
             raise ValueError(f"Unsupported database type: {self.db_type}")
         
+        # Opt-in: the agent only reads, so the server can enforce it as well
+        if get_env_bool("DB_READ_ONLY"):
+            if self.db_type == "postgresql":
+                self.conn.set_session(readonly=True)
+            elif self.db_type == "mysql":
+                with self.conn.cursor() as cursor:
+                    cursor.execute("SET SESSION TRANSACTION READ ONLY")
+            else:
+                self.conn.execute("PRAGMA query_only = ON")
+        
         return self.conn
     
     def close(self):
@@ -138,127 +209,451 @@ def get_db_connection(db_name: str = None):
     return db.connect(db_name), db.db_type
 
 
+class _ConnectionPool:
+    """Keeps idle connections to one database for reuse."""
+    
+    def __init__(self, db_name: str, db_type: str, max_idle: int):
+        self.db_name = db_name
+        self.db_type = db_type
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+    
+    def get(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return DatabaseConnection(self.db_name).connect()
+            if self._is_alive(conn):
+                return conn
+            try:
+                conn.close()
+            except Exception:
+                pass
+    
+    def _is_alive(self, conn) -> bool:
+        """Check an idle connection before reuse; the server may have dropped it.
+        
+        A dead connection is replaced through connect() rather than revived in
+        place, so the new session gets its settings (DB_READ_ONLY) again.
+        """
+        try:
+            if self.db_type == "postgresql":
+                # conn.closed only reflects a client-side close; a server-side
+                # drop shows up on the next round trip
+                if conn.closed:
+                    return False
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            else:
+                conn.ping(reconnect=False)
+            return True
+        except Exception as e:
+            logger.debug(f"Discarding dead pooled connection: {e}")
+            return False
+    
+    def put(self, conn):
+        if self._idle.qsize() >= self.max_idle:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+@contextmanager
+def db_connection(db_name: str = None):
+    """Yield (conn, db_type) for one unit of work.
+    
+    With DB_POOL_ENABLED, PostgreSQL and MySQL connections are returned to a
+    per-database pool (up to DB_POOL_MAX idle) instead of being closed, so
+    later calls skip the TCP/TLS handshake and authentication. SQLite is
+    never pooled; opening a file is cheap.
+    """
+    db_type = get_env("DB_TYPE", "postgresql")
+    if not get_env_bool("DB_POOL_ENABLED") or db_type == "sqlite":
+        conn, db_type = get_db_connection(db_name)
+        try:
+            yield conn, db_type
+        finally:
+            conn.close()
+        return
+    
+    key = (db_type, db_name or get_env("DB_NAME"))
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = _ConnectionPool(db_name, db_type, get_env_int("DB_POOL_MAX", 10))
+    
+    conn = pool.get()
+    try:
+        yield conn, db_type
+    except Exception:
+        # Don't hand a connection in an unknown state to the next caller
+        conn.close()
+        raise
+    else:
+        # End the read transaction before the connection is reused; if that
+        # fails the connection is broken, so drop it instead of pooling it
+        try:
+            conn.rollback()
+        except Exception as e:
+            logger.warning(f"Rollback failed, closing pooled connection: {e}")
+            try:
+                conn.close()
+            except Exception:
+                pass
+        else:
+            pool.put(conn)
+
+
+@contextmanager
+def _borrow_connection(db_name: str = None, conn=None):
+    """Yield (conn, db_type), using the caller's connection when given."""
+    if conn is not None:
+        yield conn, get_env("DB_TYPE", "postgresql")
+        return
+    with db_connection(db_name) as borrowed:
+        yield borrowed
+
+
 # ============================================================================
 # Schema Discovery
 # ============================================================================
 
-def discover_schema(database: str = None, table_filter: list = None) -> dict:
+# Discovered schemas keyed by (db_type, database, table_filter), with the
+# monotonic time they were fetched
+_SCHEMA_CACHE = {}
+
+
+def clear_schema_cache():
+    """Forget cached schemas, e.g. after a migration."""
+    _SCHEMA_CACHE.clear()
+
+
+# Database errors meaning the cached schema no longer matches the database
+_STALE_SCHEMA_RE = re.compile(
+    r"no such (?:column|table)|unknown column|(?:column|relation) .* does not exist"
+    r"|table .* doesn't exist",
+    re.IGNORECASE
+)
+
+
+def _forget_schema(database: str = None):
+    """Drop cached schemas for one database, whatever the table filter."""
+    for key in list(_SCHEMA_CACHE):
+        if key[1] == database:
+            _SCHEMA_CACHE.pop(key, None)
+
+
+def _group_columns(rows) -> list:
+    """Group (table, column, type, nullable) rows into schema tables."""
+    tables = []
+    by_name = {}
+    for table_name, col_name, col_type, nullable in rows:
+        table = by_name.get(table_name)
+        if table is None:
+            table = by_name[table_name] = {
+                "name": table_name,
+                "description": f"Table {table_name}",
+                "columns": []
+            }
+            tables.append(table)
+        table["columns"].append({
+            "name": col_name,
+            "type": col_type,
+            "nullable": nullable
+        })
+    return tables
+
+
+def discover_schema(database: str = None, table_filter: list = None, *,
+                    conn=None, refresh: bool = False) -> dict:
     """Discover database schema.
     
+    Columns for all tables are fetched in a single query. Results are cached
+    per process for SCHEMA_CACHE_TTL seconds (default 300, 0 disables).
+    
     Args:
         database: Database name (optional)
         table_filter: List of table names to filter (optional)
+        conn: Open connection to use instead of connecting (optional)
+        refresh: Ignore any cached schema and fetch it again
     
     Returns:
         Schema dict with tables and columns
     """
-    conn, db_type = get_db_connection(database)
+    db_type = get_env("DB_TYPE", "postgresql")
+    ttl = get_env_int("SCHEMA_CACHE_TTL", 300)
+    cache_key = (db_type, database, tuple(sorted(table_filter)) if table_filter else None)
     
-    try:
+    cached = None if refresh else _SCHEMA_CACHE.get(cache_key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    
+    # The table filter is applied in the query so only the needed columns
+    # come back over the wire
+    filter_params = tuple(table_filter) if table_filter else ()
+    
+    with _borrow_connection(database, conn) as (conn, db_type):
         cursor = conn.cursor()
-        tables = []
         
         if db_type == "postgresql":
-            # Get tables
-            table_query = """
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_type = 'BASE TABLE'
-            """
-            cursor.execute(table_query)
-            all_tables = [row[0] for row in cursor.fetchall()]
-            
-            # Filter tables if specified
-            if table_filter:
-                all_tables = [t for t in all_tables if t in table_filter]
-            
-            # Get columns for each table
-            for table_name in all_tables:
-                cursor.execute("""
-                    SELECT column_name, data_type, is_nullable
-                    FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = %s
-                    ORDER BY ordinal_position
-                """, (table_name,))
-                
-                columns = []
-                for row in cursor.fetchall():
-                    columns.append({
-                        "name": row[0],
-                        "type": row[1],
-                        "nullable": row[2] == "YES"
-                    })
-                
-                tables.append({
-                    "name": table_name,
-                    "description": f"Table {table_name}",
-                    "columns": columns
-                })
+            cursor.execute("""
+                SELECT c.table_name, c.column_name, c.data_type, c.is_nullable
+                FROM information_schema.columns c
+                JOIN information_schema.tables t
+                  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+                WHERE c.table_schema = 'public'
+                AND t.table_type = 'BASE TABLE'
+                AND (%s OR c.table_name = ANY(%s))
+                ORDER BY c.table_name, c.ordinal_position
+            """, (not filter_params, list(filter_params)))
+            rows = [(row[0], row[1], row[2], row[3] == "YES") for row in cursor.fetchall()]
         
         elif db_type == "mysql":
-            cursor.execute("SHOW TABLES")
-            all_tables = [row[0] for row in cursor.fetchall()]
-            
-            if table_filter:
-                all_tables = [t for t in all_tables if t in table_filter]
-            
-            for table_name in all_tables:
-                cursor.execute(f"DESCRIBE `{table_name}`")
-                columns = []
-                for row in cursor.fetchall():
-                    columns.append({
-                        "name": row[0],
-                        "type": row[1],
-                        "nullable": row[2] == "YES"
-                    })
-                
-                tables.append({
-                    "name": table_name,
-                    "description": f"Table {table_name}",
-                    "columns": columns
-                })
+            in_clause = ""
+            if filter_params:
+                in_clause = "AND table_name IN (" + ", ".join(["%s"] * len(filter_params)) + ")"
+            cursor.execute(f"""
+                SELECT table_name, column_name, column_type, is_nullable
+                FROM information_schema.columns
+                WHERE table_schema = DATABASE()
+                {in_clause}
+                ORDER BY table_name, ordinal_position
+            """, filter_params or None)
+            rows = [(row[0], row[1], row[2], row[3] == "YES") for row in cursor.fetchall()]
         
         elif db_type == "sqlite":
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            all_tables = [row[0] for row in cursor.fetchall()]
-            all_tables = [t for t in all_tables if not t.startswith("sqlite_")]
-            
-            if table_filter:
-                all_tables = [t for t in all_tables if t in table_filter]
-            
-            for table_name in all_tables:
-                cursor.execute(f'PRAGMA table_info("{table_name}")')
-                columns = []
-                for row in cursor.fetchall():
-                    columns.append({
-                        "name": row[1],
-                        "type": row[2],
-                        "nullable": not row[3]  # notnull column
-                    })
-                
-                tables.append({
-                    "name": table_name,
-                    "description": f"Table {table_name}",
-                    "columns": columns
-                })
+            in_clause = ""
+            if filter_params:
+                in_clause = "AND m.name IN (" + ", ".join(["?"] * len(filter_params)) + ")"
+            cursor.execute(f"""
+                SELECT m.name, p.name, p.type, p."notnull"
+                FROM sqlite_master m
+                JOIN pragma_table_info(m.name) p
+                WHERE m.type = 'table'
+                {in_clause}
+                ORDER BY m.rowid, p.cid
+            """, filter_params)
+            rows = [
+                (row[0], row[1], row[2], not row[3])  # notnull column
+                for row in cursor.fetchall()
+                if not row[0].startswith("sqlite_")
+            ]
+        
+        else:
+            rows = []
         
         cursor.close()
         
-        return {
+        schema = {
             "database": database or get_env("DB_NAME", "default"),
             "db_type": db_type,
-            "tables": tables
+            "tables": _group_columns(rows)
         }
     
-    finally:
-        conn.close()
+    if ttl > 0:
+        _SCHEMA_CACHE[cache_key] = (time.monotonic(), schema)
+    return schema
 
 
 # ============================================================================
 # SQL Generation via LLM
 # ============================================================================
 
+# In-process LLM response cache: key -> (expires_at, content)
+_LLM_CACHE = {}
+_LLM_CACHE_MAX_ENTRIES = 256
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_llm_cache_redis():
+    """Get a Redis client for the shared LLM cache if REDIS_URL is set."""
+    redis_url = get_env("REDIS_URL")
+    if not redis_url:
+        return None
+    
+    try:
+        import redis
+    except ImportError:
+        logger.debug("Redis not installed, using in-process LLM cache only")
+        return None
+    
+    use_ssl = urlparse(redis_url).scheme == "rediss"
+    try:
+        client = redis.from_url(
+            redis_url,
+            ssl_cert_reqs=ssl.CERT_REQUIRED if use_ssl else None,
+            decode_responses=True
+        )
+        client.ping()
+        return client
+    except Exception as e:
+        logger.warning(f"Redis connection failed: {e}")
+        return None
+
+
+def _hash_parts(*parts: str) -> str:
+    """Hex digest of the parts, NUL-separated so boundaries can't shift."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _llm_cache_key(*parts: str) -> str:
+    """Hash the request parts that determine an LLM response."""
+    return f"query_agent:llm:{_hash_parts(*parts)}"
+
+
+def _llm_cache_get(key: str) -> Optional[str]:
+    with _LLM_CACHE_LOCK:
+        entry = _LLM_CACHE.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    
+    redis_client = _get_llm_cache_redis()
+    if redis_client:
+        try:
+            return redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+    return None
+
+
+def _llm_cache_set(key: str, content: str, ttl: int):
+    now = time.monotonic()
+    with _LLM_CACHE_LOCK:
+        # Drop expired entries first, then the oldest insertion if still full
+        for stale in [k for k, (expires_at, _) in _LLM_CACHE.items() if expires_at <= now]:
+            _LLM_CACHE.pop(stale, None)
+        _LLM_CACHE.pop(key, None)
+        if len(_LLM_CACHE) >= _LLM_CACHE_MAX_ENTRIES:
+            _LLM_CACHE.pop(next(iter(_LLM_CACHE)), None)
+        _LLM_CACHE[key] = (now + ttl, content)
+    
+    redis_client = _get_llm_cache_redis()
+    if redis_client:
+        try:
+            redis_client.setex(key, ttl, content)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+
+def _chat_completion(system_prompt: str, user_content: str, timeout: int,
+                     stop_when=None, model: str = None, api_base: str = None) -> str:
+    """Send a system + user message pair and return the reply text.
+    
+    Calls run at temperature 0, so with LLM_CACHE_MODE=exact (the default)
+    identical requests within LLM_CACHE_TTL seconds reuse the earlier
+    reply, from memory or from Redis when REDIS_URL is set.
+    
+    With LLM_STREAM=true the reply is read as server-sent events, and
+    stop_when(partial_text) is checked after every chunk; returning True
+    closes the stream early and the partial text is returned uncached.
+    
+    model and api_base default to LLM_MODEL and LLM_API_BASE.
+    """
+    api_base = api_base or get_env("LLM_API_BASE", required=True)
+    model = model or get_env("LLM_MODEL", required=True)
+    api_key = get_env("LLM_API_KEY", "")
+    
+    cache_key = None
+    if get_env("LLM_CACHE_MODE", "exact") == "exact":
+        cache_key = _llm_cache_key(api_base, model, system_prompt, user_content)
+        cached = _llm_cache_get(cache_key)
+        if cached is not None:
+            logger.info("Using cached LLM response")
+            return cached
+    
+    headers = {}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    
+    stream = get_env_bool("LLM_STREAM")
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        "temperature": 0.0
+    }
+    if stream:
+        payload["stream"] = True
+    
+    resp = _LLM_SESSION.post(
+        f"{api_base}/chat/completions",
+        headers=headers,
+        data=orjson.dumps(payload) if orjson is not None else json.dumps(payload),
+        timeout=timeout,
+        stream=stream
+    )
+    resp.raise_for_status()
+    
+    if stream:
+        content, stopped = _read_stream(resp, stop_when)
+        if stopped:
+            return content
+    else:
+        content = _json_loads(resp.content)["choices"][0]["message"]["content"]
+    
+    if cache_key:
+        _llm_cache_set(cache_key, content, get_env_int("LLM_CACHE_TTL", 3600))
+    return content
+
+
+def _read_stream(resp, stop_when=None) -> Tuple[str, bool]:
+    """Collect delta content from an SSE chat completion stream.
+    
+    Returns the text and whether stop_when ended the stream early.
+    """
+    content = ""
+    with resp:
+        # SSE is UTF-8 by spec; without a charset requests would fall back to
+        # ISO-8859-1 for text/event-stream and mangle non-ASCII deltas
+        resp.encoding = "utf-8"
+        for line in resp.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            choices = _json_loads(data).get("choices") or [{}]
+            delta = choices[0].get("delta", {}).get("content")
+            if not delta:
+                continue
+            content += delta
+            if stop_when and stop_when(content):
+                return content, True
+    return content, False
+
+
+def _compile_prompt(template: str):
+    """Parse a str.format-style prompt template once.
+    
+    Returns a render(**values) function that joins the pre-split literal
+    chunks with the values, skipping the format parser on every call.
+    """
+    parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+    
+    def render(**values) -> str:
+        out = []
+        for literal, field in parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(values[field]))
+        return "".join(out)
+    
+    return render
+
+
 SQL_GENERATION_PROMPT = """You are a SQL query generator for a data exploration system.
 
 Your job:
@@ -307,6 +702,8 @@ Example (impossible):
 
 IMPORTANT: Return ONLY the JSON object, no additional text."""
 
+_render_sql_prompt = _compile_prompt(SQL_GENERATION_PROMPT)
+
 
 def _format_schema_for_prompt(schema: dict) -> str:
     """Format schema for LLM prompt."""
@@ -321,9 +718,52 @@ def _format_schema_for_prompt(schema: dict) -> str:
     return "\n".join(lines)
 
 
+# Formatted SQL generation prompts keyed by id(schema). The schema itself is
+# kept in the entry so the id can't be reused by a different dict.
+_SYSTEM_PROMPT_CACHE = {}
+_SYSTEM_PROMPT_CACHE_MAX_ENTRIES = 8
+_SYSTEM_PROMPT_CACHE_LOCK = threading.Lock()
+
+
+def _sql_system_prompt(schema: dict) -> str:
+    """Build the SQL generation prompt once per discovered schema."""
+    with _SYSTEM_PROMPT_CACHE_LOCK:
+        entry = _SYSTEM_PROMPT_CACHE.get(id(schema))
+    if entry and entry[0] is schema:
+        return entry[1]
+    
+    prompt = _render_sql_prompt(
+        schema_description=_format_schema_for_prompt(schema),
+        db_type=schema["db_type"]
+    )
+    with _SYSTEM_PROMPT_CACHE_LOCK:
+        _SYSTEM_PROMPT_CACHE.pop(id(schema), None)
+        if len(_SYSTEM_PROMPT_CACHE) >= _SYSTEM_PROMPT_CACHE_MAX_ENTRIES:
+            _SYSTEM_PROMPT_CACHE.pop(next(iter(_SYSTEM_PROMPT_CACHE)), None)
+        _SYSTEM_PROMPT_CACHE[id(schema)] = (schema, prompt)
+    return prompt
+
+
+# Completed "sql" string value in a partially streamed JSON reply
+_SQL_FIELD_RE = re.compile(r'"sql"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+# Draft-model outcomes: accepted as-is vs. re-run on LLM_MODEL
+_TIER_STATS = {"draft_hit": 0, "escalated": 0}
+_TIER_STATS_LOCK = threading.Lock()
+
+# Draft answers below this confidence are re-run on LLM_MODEL
+# (override with LLM_DRAFT_MIN_CONFIDENCE)
+DRAFT_MIN_CONFIDENCE = 0.7
+
+
 def generate_sql(question: str, schema: dict) -> dict:
     """Generate SQL from natural language question using LLM.
     
+    When LLM_MODEL_DRAFT names a different (smaller, cheaper) model, it
+    answers first; its SQL is used if it is confident and passes
+    validate_sql(), otherwise the question is re-run on LLM_MODEL.
+    
     Args:
         question: Natural language question
         schema: Database schema from discover_schema()
@@ -331,17 +771,45 @@ def generate_sql(question: str, schema: dict) -> dict:
     Returns:
         Dict with sql, reasoning, confidence, error
     """
-    api_base = get_env("LLM_API_BASE", required=True)
     model = get_env("LLM_MODEL", required=True)
-    api_key = get_env("LLM_API_KEY", "")
-    timeout = get_env_int("LLM_TIMEOUT", 120)
+    draft_model = get_env("LLM_MODEL_DRAFT", model)
+    if draft_model == model:
+        return _generate_sql_with(question, schema, model)
     
-    schema_desc = _format_schema_for_prompt(schema)
+    min_confidence = float(get_env("LLM_DRAFT_MIN_CONFIDENCE", DRAFT_MIN_CONFIDENCE))
     
-    system_prompt = SQL_GENERATION_PROMPT.format(
-        schema_description=schema_desc,
-        db_type=schema["db_type"]
-    )
+    # Any draft failure (timeout, HTTP error, unparseable reply or
+    # confidence) just escalates to the main model
+    try:
+        draft = _generate_sql_with(
+            question, schema, draft_model, get_env("LLM_API_BASE_DRAFT")
+        )
+        accepted = bool(
+            draft.get("sql")
+            and float(draft.get("confidence", 0)) >= min_confidence
+            and validate_sql(draft["sql"], schema)["valid"]
+        )
+    except Exception as e:
+        logger.warning(f"Draft model {draft_model} failed: {e}")
+        accepted = False
+    
+    if accepted:
+        with _TIER_STATS_LOCK:
+            _TIER_STATS["draft_hit"] += 1
+        return draft
+    
+    logger.info(f"Draft SQL not accepted, escalating to {model}")
+    with _TIER_STATS_LOCK:
+        _TIER_STATS["escalated"] += 1
+    return _generate_sql_with(question, schema, model)
+
+
+def _generate_sql_with(question: str, schema: dict, model: str,
+                       api_base: str = None) -> dict:
+    """Ask one model for SQL; see generate_sql()"""
+    timeout = get_env_int("LLM_TIMEOUT", 120)
+    
+    system_prompt = _sql_system_prompt(schema)
     
     user_message = {
         "question": question,
@@ -350,38 +818,44 @@ def generate_sql(question: str, schema: dict) -> dict:
     
     logger.info(f"Generating SQL for: {question[:60]}...")
     
-    headers = {"Content-Type": "application/json"}
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-    
-    resp = requests.post(
-        f"{api_base}/chat/completions",
-        headers=headers,
-        json={
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(user_message)}
-            ],
-            "temperature": 0.0
-        },
-        timeout=timeout
+    # When streaming, stop as soon as the "sql" value is complete and
+    # contains a disallowed keyword; validation would reject it anyway
+    rejected = {}
+    
+    def sql_is_disallowed(partial: str) -> bool:
+        match = _SQL_FIELD_RE.search(partial)
+        if not match:
+            return False
+        sql = json.loads(f'"{match.group(1)}"')
+        if _DISALLOWED_RE.search(sql.upper()):
+            rejected["sql"] = sql
+            return True
+        return False
+    
+    content = _chat_completion(
+        system_prompt, _json_dumps(user_message), timeout,
+        stop_when=sql_is_disallowed, model=model, api_base=api_base
     )
-    resp.raise_for_status()
     
-    content = resp.json()["choices"][0]["message"]["content"]
+    if rejected:
+        logger.info("SQL generation stopped early: disallowed keyword")
+        return {
+            "sql": rejected["sql"],
+            "reasoning": "Generation stopped early: disallowed keyword in SQL",
+            "confidence": 0.0
+        }
     
     # Extract JSON
     try:
-        result = json.loads(content)
+        result = _json_loads(content)
     except json.JSONDecodeError:
         match = re.search(r'\{.*\}', content, re.DOTALL)
         if match:
-            result = json.loads(match.group())
+            result = _json_loads(match.group())
         else:
             raise ValueError(f"Could not parse SQL generation response: {content[:200]}")
     
-    logger.info(f"SQL generated: confidence={result.get('confidence', 0)}")
+    logger.info(f"SQL generated by {model}: confidence={result.get('confidence', 0)}")
     return result
 
 
@@ -394,6 +868,16 @@ DISALLOWED_KEYWORDS = [
     "GRANT", "REVOKE", "EXEC", "EXECUTE", "SP_", "XP_", "SCRIPT"
 ]
 
+# One pass over the query for all keywords, matched as whole words so
+# columns like UPDATED_AT or CREATED_BY don't trip the check. SP_/XP_ are
+# procedure-name prefixes and only need a leading boundary.
+_DISALLOWED_RE = re.compile(
+    "|".join(
+        rf"\b{re.escape(keyword)}" + (r"\b" if keyword[-1].isalnum() else "")
+        for keyword in DISALLOWED_KEYWORDS
+    )
+)
+
 ALLOWED_FUNCTIONS = [
     "SUM", "AVG", "COUNT", "MAX", "MIN", "ROUND", "UPPER", "LOWER",
     "DATE_TRUNC", "EXTRACT", "ABS", "CEIL", "FLOOR", "COALESCE", "NULLIF",
@@ -401,6 +885,32 @@ ALLOWED_FUNCTIONS = [
 ]
 
 
+# Tokens that matter when looking for the outer LIMIT: quoted strings and
+# identifiers and comments (skipped whole), parentheses, and LIMIT itself
+_LIMIT_SCAN_RE = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|--[^\n]*|/\*.*?\*/|[()]|\bLIMIT\b",
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def has_top_level_limit(sql: str) -> bool:
+    """Check whether the outermost query has a LIMIT clause.
+    
+    A LIMIT inside a subquery, string literal, quoted identifier or comment,
+    or a name such as rate_limit_id, does not count.
+    """
+    depth = 0
+    for match in _LIMIT_SCAN_RE.finditer(sql):
+        token = match.group()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token.upper() == "LIMIT":
+            return True
+    return False
+
+
 def validate_sql(sql: str, schema: dict) -> dict:
     """Validate SQL for safety.
     
@@ -415,8 +925,9 @@ def validate_sql(sql: str, schema: dict) -> dict:
     sql_upper = sql.upper()
     
     # Check for disallowed keywords
+    found = set(_DISALLOWED_RE.findall(sql_upper))
     for keyword in DISALLOWED_KEYWORDS:
-        if keyword in sql_upper:
+        if keyword in found:
             errors.append(f"Disallowed keyword: {keyword}")
     
     # Must start with SELECT
@@ -424,7 +935,7 @@ def validate_sql(sql: str, schema: dict) -> dict:
         errors.append("Query must start with SELECT")
     
     # Check for LIMIT
-    if "LIMIT" not in sql_upper:
+    if not has_top_level_limit(sql):
         errors.append("Query should include LIMIT clause")
     
     # Check table names exist
@@ -441,48 +952,67 @@ def validate_sql(sql: str, schema: dict) -> dict:
 # Query Execution
 # ============================================================================
 
-def execute_query(sql: str, database: str = None, max_rows: int = 10000) -> dict:
+# Rows pulled from the database per round trip
+FETCH_BATCH_SIZE = 2000
+
+
+@functools.lru_cache(maxsize=64)
+def _row_class(columns: tuple):
+    """Namedtuple type for result rows with these columns.
+    
+    Every row of a result shares its columns, so a fixed-size tuple avoids
+    building a hash table per row. Column names that aren't valid
+    identifiers (e.g. "SUM(amount)") get positional field names; read
+    values by position alongside results["columns"].
+    """
+    return namedtuple("Row", columns, rename=True)
+
+
+def execute_query(sql: str, database: str = None, max_rows: int = 10000, *, conn=None) -> dict:
     """Execute SQL query and return results.
     
     Args:
         sql: SQL query
         database: Database name
         max_rows: Maximum rows to return
+        conn: Open connection to use instead of connecting (optional)
     
     Returns:
         Dict with columns, rows, row_count, execution_time_ms
     """
-    conn, db_type = get_db_connection(database)
-    
-    try:
-        cursor = conn.cursor()
-        start_time = datetime.now()
+    with _borrow_connection(database, conn) as (conn, db_type):
+        # Stream rows from the server instead of buffering the whole result
+        # client-side before converting it
+        if db_type == "postgresql":
+            cursor = conn.cursor(name="query_agent_stream")
+            cursor.itersize = FETCH_BATCH_SIZE
+        elif db_type == "mysql":
+            import pymysql.cursors
+            cursor = conn.cursor(pymysql.cursors.SSCursor)
+        else:
+            cursor = conn.cursor()
+        start_ns = time.perf_counter_ns()
         
         # Add LIMIT if not present
-        sql_upper = sql.upper()
-        if "LIMIT" not in sql_upper:
-            sql = sql.rstrip(";") + f" LIMIT {max_rows}"
+        if not has_top_level_limit(sql):
+            sql = sql.rstrip().rstrip(";") + f"\nLIMIT {max_rows}"
         
         cursor.execute(sql)
         
-        # Fetch results
-        rows = cursor.fetchall()
-        
-        # Get column names
-        if cursor.description:
-            columns = [desc[0] for desc in cursor.description]
-        else:
-            columns = []
-        
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
-        
-        # Convert to dicts
+        # Fetch results in batches, converting each row to a namedtuple as
+        # it arrives. Named cursors only expose description after a fetch.
+        columns = None
         result_rows = []
-        for row in rows[:max_rows]:
-            if hasattr(row, 'keys'):
-                result_rows.append(dict(row))
-            else:
-                result_rows.append(dict(zip(columns, row)))
+        while len(result_rows) < max_rows:
+            batch = cursor.fetchmany(min(FETCH_BATCH_SIZE, max_rows - len(result_rows)))
+            if columns is None:
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                make_row = _row_class(tuple(columns))._make
+            if not batch:
+                break
+            result_rows.extend(map(make_row, batch))
+        
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e6
         
         cursor.close()
         
@@ -492,9 +1022,6 @@ def execute_query(sql: str, database: str = None, max_rows: int = 10000) -> dict
             "row_count": len(result_rows),
             "execution_time_ms": round(execution_time, 2)
         }
-    
-    finally:
-        conn.close()
 
 
 # ============================================================================
@@ -522,6 +1049,13 @@ Output format: ONLY valid JSON with keys:
 
 IMPORTANT: Return ONLY the JSON object, no additional text."""
 
+_render_summarization_prompt = _compile_prompt(SUMMARIZATION_PROMPT)
+
+
+# Results with fewer than LLM_SUMMARIZE_MIN_ROWS rows and less than this much
+# cell text are summarized without the LLM
+TRIVIAL_RESULT_CHARS = 512
+
 
 def summarize_results(question: str, sql: str, results: dict) -> dict:
     """Summarize query results using LLM.
@@ -534,15 +1068,31 @@ def summarize_results(question: str, sql: str, results: dict) -> dict:
     Returns:
         Dict with summary, key_findings, data_quality_notes
     """
-    api_base = get_env("LLM_API_BASE", required=True)
-    model = get_env("LLM_MODEL", required=True)
-    api_key = get_env("LLM_API_KEY", "")
+    # Empty and tiny results are described directly; an LLM round trip
+    # adds seconds without telling the user anything the row doesn't
+    rows = results["rows"]
+    min_rows = get_env_int("LLM_SUMMARIZE_MIN_ROWS", 2)
+    if not rows or (
+        results["row_count"] < min_rows
+        and sum(len(str(v)) for row in rows for v in row) < TRIVIAL_RESULT_CHARS
+    ):
+        row_count = results["row_count"]
+        return {
+            "summary": f"Query returned {row_count} {'row' if row_count == 1 else 'rows'}",
+            "key_findings": [
+                f"{k}={'NULL' if v is None else v}"
+                for k, v in zip(results["columns"], rows[0])
+            ][:5] if rows else [],
+            "data_quality_notes": []
+        }
+    
     timeout = get_env_int("LLM_TIMEOUT", 60)
     
     # Sample results for LLM
-    sample = json.dumps(results["rows"][:20], indent=2)
+    columns = results["columns"]
+    sample = _json_dumps([dict(zip(columns, row)) for row in rows[:20]], indent=True)
     
-    system_prompt = SUMMARIZATION_PROMPT.format(
+    system_prompt = _render_summarization_prompt(
         question=question,
         sql=sql,
         row_count=results["row_count"],
@@ -551,33 +1101,14 @@ def summarize_results(question: str, sql: str, results: dict) -> dict:
     
     logger.info("Summarizing results...")
     
-    headers = {"Content-Type": "application/json"}
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-    
-    resp = requests.post(
-        f"{api_base}/chat/completions",
-        headers=headers,
-        json={
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Summarize these results"}
-            ],
-            "temperature": 0.0
-        },
-        timeout=timeout
-    )
-    resp.raise_for_status()
-    
-    content = resp.json()["choices"][0]["message"]["content"]
+    content = _chat_completion(system_prompt, "Summarize these results", timeout)
     
     try:
-        result = json.loads(content)
+        result = _json_loads(content)
     except json.JSONDecodeError:
         match = re.search(r'\{.*\}', content, re.DOTALL)
         if match:
-            result = json.loads(match.group())
+            result = _json_loads(match.group())
         else:
             result = {
                 "summary": "Query executed successfully",
@@ -592,8 +1123,53 @@ def summarize_results(question: str, sql: str, results: dict) -> dict:
 # XML Export and Storage
 # ============================================================================
 
-def results_to_xml(question: str, sql: str, results: dict, summary: dict) -> str:
-    """Convert results to XML format.
+def _xml_escape(text: str) -> str:
+    """Escape element text the way ElementTree does.
+    
+    Most cells contain nothing to escape, and a containment check per
+    character is far cheaper than an unconditional replace (or translate).
+    """
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+_XML_ATTR_ESCAPES = (
+    ('"', "&quot;"), ("\r", "&#13;"), ("\n", "&#10;"), ("\t", "&#09;")
+)
+
+
+def _xml_attr(value: str) -> str:
+    """Escape an attribute value the way ElementTree does."""
+    value = _xml_escape(value)
+    for char, entity in _XML_ATTR_ESCAPES:
+        if char in value:
+            value = value.replace(char, entity)
+    return value
+
+
+def _xml_element(tag: str, text: str) -> str:
+    """Serialize a text-only element, self-closing when text is empty."""
+    if not text:
+        return f"<{tag} />"
+    return f"<{tag}>{_xml_escape(text)}</{tag}>"
+
+
+# Rows serialized per chunk yielded by iter_results_xml()
+XML_CHUNK_ROWS = 1000
+
+# Serialized rows spooled while the summary is generated stay in memory up
+# to this size and spill to a temporary file beyond it
+XML_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+XML_SPOOL_READ_SIZE = 1024 * 1024
+
+
+def results_to_xml(question: str, sql: str, results: dict, summary: dict) -> bytes:
+    """Convert results to UTF-8 encoded XML.
     
     Args:
         question: Original question
@@ -602,61 +1178,185 @@ def results_to_xml(question: str, sql: str, results: dict, summary: dict) -> str
         summary: Summary dict
     
     Returns:
-        XML string
+        XML bytes
     """
-    root = ET.Element("queryResult")
+    return b"".join(iter_results_xml(question, sql, results, summary))
+
+
+def iter_results_xml(question: str, sql: str, results: dict, summary: dict):
+    """Generate the results XML in chunks.
+    
+    The document is flat (metadata, column list, rows of text cells), so it
+    is written directly as strings rather than through an ElementTree.
+    Rows are emitted XML_CHUNK_ROWS at a time and encoded chunk by chunk,
+    so a consumer writing each chunk out never holds more than one chunk
+    of serialized rows, and never a second, encoded copy of the document.
+    
+    Yields:
+        UTF-8 fragments that concatenate to results_to_xml()
+    """
+    yield _xml_head(question, sql, results, summary)
+    yield from _iter_xml_rows(results)
+
+
+def _xml_head(question: str, sql: str, results: dict, summary: dict) -> bytes:
+    """Serialize everything before the rows: metadata and schema."""
+    parts = ["<queryResult>"]
     
     # Metadata
-    metadata = ET.SubElement(root, "metadata")
-    ET.SubElement(metadata, "query").text = question
-    ET.SubElement(metadata, "sql").text = sql
-    ET.SubElement(metadata, "generatedAt").text = datetime.utcnow().isoformat() + "Z"
-    ET.SubElement(metadata, "rowCount").text = str(results["row_count"])
-    ET.SubElement(metadata, "executionTimeMs").text = str(results["execution_time_ms"])
+    parts.append("<metadata>")
+    parts.append(_xml_element("query", question))
+    parts.append(_xml_element("sql", sql))
+    parts.append(_xml_element("generatedAt", datetime.utcnow().isoformat() + "Z"))
+    parts.append(_xml_element("rowCount", str(results["row_count"])))
+    parts.append(_xml_element("executionTimeMs", str(results["execution_time_ms"])))
     
     if summary.get("summary"):
-        ET.SubElement(metadata, "summary").text = summary["summary"]
+        parts.append(_xml_element("summary", str(summary["summary"])))
     
     # Key findings
     if summary.get("key_findings"):
-        findings = ET.SubElement(metadata, "keyFindings")
+        parts.append("<keyFindings>")
         for finding in summary["key_findings"]:
-            ET.SubElement(findings, "finding").text = finding
+            parts.append(_xml_element("finding", str(finding)))
+        parts.append("</keyFindings>")
     
     # Data quality
     if summary.get("data_quality_notes"):
-        quality = ET.SubElement(metadata, "dataQualityNotes")
+        parts.append("<dataQualityNotes>")
         for note in summary["data_quality_notes"]:
-            ET.SubElement(quality, "note").text = note
+            parts.append(_xml_element("note", str(note)))
+        parts.append("</dataQualityNotes>")
+    
+    parts.append("</metadata>")
     
     # Schema
-    schema_elem = ET.SubElement(root, "schema")
-    for col in results["columns"]:
-        col_elem = ET.SubElement(schema_elem, "column")
-        col_elem.set("name", col)
-        col_elem.set("type", "string")  # Could be improved with type detection
-    
-    # Rows
-    rows_elem = ET.SubElement(root, "rows")
-    for row in results["rows"]:
-        row_elem = ET.SubElement(rows_elem, "row")
-        for col in results["columns"]:
-            val = row.get(col, "")
-            # XML doesn't like None
-            if val is None:
-                val = ""
-            ET.SubElement(row_elem, col).text = str(val)
-    
-    # Pretty print
-    xml_str = ET.tostring(root, encoding="unicode")
-    return xml_str
-
-
-def save_to_storage(xml_content: str, filename: str = None) -> dict:
+    columns = results["columns"]
+    if columns:
+        parts.append("<schema>")
+        for col, col_type in zip(columns, _infer_types(results["rows"], columns)):
+            parts.append(f'<column name="{_xml_attr(col)}" type="{col_type}" />')
+        parts.append("</schema>")
+    else:
+        parts.append("<schema />")
+    
+    return "".join(parts).encode("utf-8")
+
+
+# XML schema type for each Python value type the database drivers return.
+# bool is listed before int because it is a subclass of it.
+_XML_TYPES = (
+    (bool, "boolean"),
+    (int, "integer"),
+    (float, "float"),
+    (decimal.Decimal, "decimal"),
+    (datetime, "datetime"),
+    (date, "date"),
+    (dt_time, "time"),
+    ((bytes, bytearray, memoryview), "binary"),
+)
+
+
+def _infer_types(rows: list, columns: list) -> list:
+    """Schema type of each column, from its first non-null value.
+    
+    Columns whose values are all null, or of a type not listed in
+    _XML_TYPES, are reported as "string".
+    """
+    types = []
+    for index in range(len(columns)):
+        value = next((row[index] for row in rows if row[index] is not None), None)
+        col_type = "string"
+        if value is not None:
+            for py_type, xml_type in _XML_TYPES:
+                if isinstance(value, py_type):
+                    col_type = xml_type
+                    break
+        types.append(col_type)
+    return types
+
+
+@functools.lru_cache(maxsize=64)
+def _row_emitter(columns: tuple):
+    """Compile a function that serializes rows with these columns.
+    
+    Every row of a result has the same columns, so the per-column work
+    (tag lookup, looping over cells) is unrolled once into straight-line
+    code. The generated emit(rows, append) unpacks each row into locals and
+    appends its XML fragments. Column names never appear in the source:
+    tags are passed in as constants, so any name is safe.
+    """
+    names = [f"v{index}" for index in range(len(columns))]
+    namespace = {"_xml_escape": _xml_escape, "str": str}
+    target = "".join(f"{name}, " for name in names) or "_row"
+    lines = [
+        "def emit(rows, append):",
+        f"    for {target} in rows:",
+        "        append('<row>')",
+    ]
+    for index, (col, name) in enumerate(zip(columns, names)):
+        namespace[f"OPEN{index}"] = f"<{col}>"
+        namespace[f"CLOSE{index}"] = f"</{col}>"
+        namespace[f"EMPTY{index}"] = f"<{col} />"
+        # XML doesn't like None
+        lines += [
+            f"        text = '' if {name} is None else {name} if type({name}) is str else str({name})",
+            "        if text:",
+            f"            append(OPEN{index}); append(_xml_escape(text)); append(CLOSE{index})",
+            "        else:",
+            f"            append(EMPTY{index})",
+        ]
+    lines.append("        append('</row>')")
+    exec("\n".join(lines), namespace)
+    return namespace["emit"]
+
+
+def _iter_spooled_xml(head: bytes, rows_spool):
+    """Yield the head, then the spooled rows XML_SPOOL_READ_SIZE at a time."""
+    yield head
+    while True:
+        chunk = rows_spool.read(XML_SPOOL_READ_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_xml_rows(results: dict):
+    """Serialize the rows element and close the document.
+    
+    Independent of the summary, so it can run while the summary is being
+    generated.
+    """
+    rows = results["rows"]
+    if not rows:
+        yield b"<rows /></queryResult>"
+        return
+    
+    emit = _row_emitter(tuple(results["columns"]))
+    yield b"<rows>"
+    
+    for start in range(0, len(rows), XML_CHUNK_ROWS):
+        parts = []
+        emit(rows[start:start + XML_CHUNK_ROWS], parts.append)
+        yield "".join(parts).encode("utf-8")
+    
+    yield b"</rows></queryResult>"
+
+
+def save_to_storage(xml_content, filename: str = None) -> dict:
     """Save XML to configured storage.
     
+    Chunks are written to the local file, or streamed to S3, Azure and GCS,
+    as they are produced. Google Drive needs the size up front, so it
+    uploads the assembled document.
+    
+    With STORAGE_COMPRESS=true, S3, Azure and GCS uploads are gzipped on
+    the fly and stored with Content-Encoding: gzip, so HTTP clients still
+    receive plain XML.
+    
     Args:
-        xml_content: XML string
+        xml_content: XML bytes or string, or an iterable of byte chunks
+            such as iter_results_xml() returns
         filename: Optional filename (auto-generated if not provided)
     
     Returns:
@@ -669,26 +1369,85 @@ def save_to_storage(xml_content: str, filename: str = None) -> dict:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{prefix}/result_{timestamp}.xml"
     
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode("utf-8")
+    if isinstance(xml_content, bytes):
+        xml_content = (xml_content,)
+    
     if storage_type == "local":
         return _save_local(xml_content, filename)
     elif storage_type == "gdrive":
-        return _save_gdrive(xml_content, filename)
-    elif storage_type == "s3":
-        return _save_s3(xml_content, filename)
+        return _save_gdrive(b"".join(xml_content), filename)
+    
+    content_encoding = None
+    if get_env_bool("STORAGE_COMPRESS"):
+        xml_content = _gzip_chunks(xml_content)
+        content_encoding = "gzip"
+    
+    if storage_type == "s3":
+        return _save_s3(_ChunkStream(xml_content), filename, content_encoding)
     elif storage_type == "azure":
-        return _save_azure(xml_content, filename)
+        return _save_azure(_ChunkStream(xml_content), filename, content_encoding)
     elif storage_type == "gcs":
-        return _save_gcs(xml_content, filename)
+        return _save_gcs(_ChunkStream(xml_content), filename, content_encoding)
     else:
         raise ValueError(f"Unsupported storage type: {storage_type}")
 
 
-def _save_local(xml_content: str, filename: str) -> dict:
+# Repeated tags compress well; level 5 gets most of the size reduction of
+# level 9 at a fraction of the CPU time
+STORAGE_COMPRESS_LEVEL = 5
+
+
+def _gzip_chunks(chunks):
+    """Gzip an iterable of byte chunks as they are produced."""
+    compressor = zlib.compressobj(STORAGE_COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class _ChunkStream(io.RawIOBase):
+    """Read-only file object over an iterable of byte chunks.
+    
+    Lets upload APIs that read from a file pull the XML as it is produced,
+    without first joining it into one buffer.
+    """
+    
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+        self._position = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self._position += size
+        return size
+    
+    def tell(self) -> int:
+        return self._position
+
+
+def _save_local(xml_content, filename: str) -> dict:
     """Save to local filesystem."""
     base_path = get_env("STORAGE_LOCAL_PATH", "./results")
     filepath = Path(base_path) / filename
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    filepath.write_text(xml_content, encoding="utf-8")
+    with open(filepath, "wb") as f:
+        for chunk in xml_content:
+            f.write(chunk)
     
     return {
         "path": str(filepath),
@@ -697,63 +1456,122 @@ def _save_local(xml_content: str, filename: str) -> dict:
     }
 
 
-def _save_gdrive(xml_content: str, filename: str) -> dict:
-    """Save to Google Drive."""
+# Uploads above this size go through a resumable session in GDRIVE_CHUNK_SIZE
+# pieces so a dropped connection only costs the current chunk
+GDRIVE_RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+GDRIVE_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=8)
+def _gdrive_service(creds_path: str):
+    """Build the Drive client once per credentials file.
+    
+    Uses the discovery document bundled with googleapiclient, so repeated
+    exports in one process skip both the network fetch and the parse.
+    """
     from googleapiclient.discovery import build
     from google.oauth2 import service_account
     
-    creds_path = get_env("STORAGE_GDRIVE_CREDENTIALS", required=True)
-    folder_id = get_env("STORAGE_GDRIVE_FOLDER_ID")
-    
     credentials = service_account.Credentials.from_service_account_file(
         creds_path,
         scopes=["https://www.googleapis.com/auth/drive"]
     )
-    service = build("drive", "v3", credentials=credentials)
+    return build(
+        "drive", "v3",
+        credentials=credentials,
+        cache_discovery=False,
+        static_discovery=True
+    )
+
+
+def _save_gdrive(xml_content: bytes, filename: str) -> dict:
+    """Save to Google Drive."""
+    from googleapiclient.http import MediaIoBaseUpload
     
-    # Create temp file
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".xml", delete=False) as tmp:
-        tmp.write(xml_content)
-        tmp_path = tmp.name
+    creds_path = get_env("STORAGE_GDRIVE_CREDENTIALS", required=True)
+    folder_id = get_env("STORAGE_GDRIVE_FOLDER_ID")
     
-    try:
-        file_metadata = {
-            "name": Path(filename).name,
-            "mimeType": "application/xml"
-        }
-        if folder_id:
-            file_metadata["parents"] = [folder_id]
-        
-        media = service.files().create(
-            body=file_metadata,
-            media_body=tmp_path,
-            fields="id, webViewLink"
-        ).execute()
-        
-        return {
-            "path": f"gdrive://{file_metadata['name']}",
-            "url": media.get("webViewLink", f"gdrive://{media['id']}"),
-            "storage_type": "gdrive",
-            "file_id": media["id"]
-        }
-    finally:
-        Path(tmp_path).unlink()
+    service = _gdrive_service(creds_path)
+    
+    file_metadata = {
+        "name": Path(filename).name,
+        "mimeType": "application/xml"
+    }
+    if folder_id:
+        file_metadata["parents"] = [folder_id]
+    
+    resumable = len(xml_content) >= GDRIVE_RESUMABLE_THRESHOLD
+    media_body = MediaIoBaseUpload(
+        io.BytesIO(xml_content),
+        mimetype="application/xml",
+        chunksize=GDRIVE_CHUNK_SIZE,
+        resumable=resumable
+    )
+    request = service.files().create(
+        body=file_metadata,
+        media_body=media_body,
+        fields="id, webViewLink"
+    )
+    
+    if resumable:
+        media = None
+        while media is None:
+            status, media = request.next_chunk()
+            if status:
+                logger.info(f"Uploaded {int(status.progress() * 100)}% to Google Drive")
+    else:
+        media = request.execute()
+    
+    return {
+        "path": f"gdrive://{file_metadata['name']}",
+        "url": media.get("webViewLink", f"gdrive://{media['id']}"),
+        "storage_type": "gdrive",
+        "file_id": media["id"]
+    }
 
 
-def _save_s3(xml_content: str, filename: str) -> dict:
-    """Save to S3."""
+# Exports above S3_MULTIPART_THRESHOLD are sent as a multipart upload of
+# S3_MULTIPART_CHUNK_SIZE parts, STORAGE_S3_CONCURRENCY (default 8) at a time
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MULTIPART_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=8)
+def _s3_client(region: str):
+    """Create the S3 client once per region.
+    
+    Credential lookup, endpoint resolution and the connection pool are then
+    shared by every export in the process; boto3 clients are thread-safe.
+    """
     import boto3
+    return boto3.client("s3", region_name=region)
+
+
+def _save_s3(stream, filename: str, content_encoding: str = None) -> dict:
+    """Save to S3."""
+    from boto3.s3.transfer import TransferConfig
     
     bucket = get_env("STORAGE_S3_BUCKET", required=True)
     region = get_env("STORAGE_S3_REGION", "us-east-1")
     key = filename
     
-    s3 = boto3.client("s3", region_name=region)
-    s3.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=xml_content.encode("utf-8"),
-        ContentType="application/xml"
+    config = TransferConfig(
+        multipart_threshold=S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=S3_MULTIPART_CHUNK_SIZE,
+        max_concurrency=get_env_int("STORAGE_S3_CONCURRENCY", 8),
+        use_threads=True
+    )
+    extra_args = {"ContentType": "application/xml"}
+    if content_encoding:
+        extra_args["ContentEncoding"] = content_encoding
+    
+    s3 = _s3_client(region)
+    s3.upload_fileobj(
+        stream,
+        bucket,
+        key,
+        ExtraArgs=extra_args,
+        Config=config
     )
     
     url = f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
@@ -764,16 +1582,30 @@ def _save_s3(xml_content: str, filename: str) -> dict:
     }
 
 
-def _save_azure(xml_content: str, filename: str) -> dict:
-    """Save to Azure Blob Storage."""
+@functools.lru_cache(maxsize=8)
+def _azure_service(conn_str: str):
+    """Create the Azure blob service client once per connection string."""
     from azure.storage.blob import BlobServiceClient
+    return BlobServiceClient.from_connection_string(conn_str)
+
+
+def _save_azure(stream, filename: str, content_encoding: str = None) -> dict:
+    """Save to Azure Blob Storage."""
+    from azure.storage.blob import ContentSettings
     
     conn_str = get_env("STORAGE_AZURE_CONNECTION_STRING", required=True)
     container = get_env("STORAGE_AZURE_CONTAINER", required=True)
     
-    blob_service = BlobServiceClient.from_connection_string(conn_str)
+    blob_service = _azure_service(conn_str)
     blob_client = blob_service.get_blob_client(container=container, blob=filename)
-    blob_client.upload_blob(xml_content.encode("utf-8"), overwrite=True)
+    blob_client.upload_blob(
+        stream,
+        overwrite=True,
+        content_settings=ContentSettings(
+            content_type="application/xml",
+            content_encoding=content_encoding
+        )
+    )
     
     return {
         "path": f"azure://{container}/{filename}",
@@ -782,16 +1614,22 @@ def _save_azure(xml_content: str, filename: str) -> dict:
     }
 
 
-def _save_gcs(xml_content: str, filename: str) -> dict:
-    """Save to Google Cloud Storage."""
+@functools.lru_cache(maxsize=1)
+def _gcs_client():
+    """Create the GCS client once, from GOOGLE_APPLICATION_CREDENTIALS."""
     from google.cloud import storage
-    
+    return storage.Client()
+
+
+def _save_gcs(stream, filename: str, content_encoding: str = None) -> dict:
+    """Save to Google Cloud Storage."""
     bucket_name = get_env("STORAGE_GCS_BUCKET", required=True)
     
-    client = storage.Client()
+    client = _gcs_client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(filename)
-    blob.upload_from_string(xml_content, content_type="application/xml")
+    blob.content_encoding = content_encoding
+    blob.upload_from_file(stream, content_type="application/xml")
     
     return {
         "path": f"gs://{bucket_name}/{filename}",
@@ -800,6 +1638,98 @@ def _save_gcs(xml_content: str, filename: str) -> dict:
     }
 
 
+# ============================================================================
+# Question Cache
+# ============================================================================
+
+# Words that don't change what is being asked for. Verbs like is/was/were
+# stay in the key: "orders were pending" and "orders are pending" differ.
+_FILLER_WORDS = frozenset(
+    "a an the me us show list give get find display tell what whats which "
+    "please can could you i we our my of for".split()
+)
+
+# Singular words that end in "s" look like these
+_KEEP_S_ENDINGS = ("ss", "us", "is")
+
+_QUESTION_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_cache (
+    key TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    result TEXT NOT NULL
+)
+"""
+
+
+def _canonicalize(question: str) -> str:
+    """Reduce a question to the words that carry its meaning.
+    
+    Lowercases, drops punctuation and filler words, and strips a plain
+    plural "s", so "Show me the Q1 orders" and "Q1 order, please" give the
+    same text. Words ending in "ss", "us" or "is" (status, analysis) keep
+    their "s". Word order is kept: "revenue by customer" and "customer by
+    revenue" are different questions.
+    """
+    words = []
+    for word in re.findall(r"[a-z0-9_]+", question.lower()):
+        if word in _FILLER_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith(_KEEP_S_ENDINGS):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+def _question_cache_key(question: str, database: str, table_filter: list) -> str:
+    """Hash the canonical question with everything else that shapes the answer."""
+    digest = _hash_parts(
+        _canonicalize(question),
+        get_env("DB_TYPE", "postgresql"),
+        database or get_env("DB_NAME", ""),
+        ",".join(sorted(table_filter or ())),
+        get_env("LLM_MODEL", "")
+    )
+    return f"query_agent:question:{digest}"
+
+
+def _question_cache_db():
+    """Open the question cache (QUERY_CACHE_PATH), creating it if needed."""
+    import sqlite3
+    path = Path(get_env(
+        "QUERY_CACHE_PATH", str(Path.home() / ".openclaw" / "querycache.db")
+    ))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute(_QUESTION_CACHE_SCHEMA)
+    return conn
+
+
+def _question_cache_get(key: str, ttl: int) -> Optional[dict]:
+    """Return a stored result younger than ttl seconds, or None."""
+    conn = _question_cache_db()
+    try:
+        row = conn.execute(
+            "SELECT result FROM query_cache WHERE key = ? AND created_at > ?",
+            (key, time.time() - ttl)
+        ).fetchone()
+    finally:
+        conn.close()
+    return _json_loads(row[0]) if row else None
+
+
+def _question_cache_set(key: str, result: dict):
+    """Store a successful query() result."""
+    conn = _question_cache_db()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO query_cache (key, created_at, result) VALUES (?, ?, ?)",
+                (key, time.time(), _json_dumps(result))
+            )
+    finally:
+        conn.close()
+
+
 # ============================================================================
 # Main Query Function
 # ============================================================================
@@ -808,7 +1738,8 @@ def query(
     question: str,
     database: str = None,
     table_filter: list = None,
-    storage_path: str = None
+    storage_path: str = None,
+    refresh_schema: bool = False
 ) -> dict:
     """Execute a natural language query and export results as XML.
     
@@ -817,56 +1748,77 @@ def query(
         database: Database name (optional)
         table_filter: List of table names to use (optional)
         storage_path: Custom storage path (optional)
+        refresh_schema: Rediscover the schema instead of using the cache
+    
+    With QUERY_CACHE_TTL_SECONDS set, a successful result is stored under
+    the canonicalized question, and a rephrasing of it within the TTL gets
+    the stored result (including the earlier XML location) back without
+    touching the LLM, database or storage.
     
     Returns:
         Dict with sql, row_count, xml_path, xml_url, summary, key_findings
     """
-    start_time = datetime.now()
-    
-    # Step 1: Discover schema
-    logger.info("Discovering schema...")
-    schema = discover_schema(database, table_filter)
-    
-    if not schema["tables"]:
-        raise ValueError("No tables found in database")
-    
-    logger.info(f"Found {len(schema['tables'])} tables")
-    
-    # Step 2: Generate SQL
-    sql_result = generate_sql(question, schema)
-    
-    if sql_result.get("error") or not sql_result.get("sql"):
-        return {
-            "success": False,
-            "error": sql_result.get("error", "Failed to generate SQL"),
-            "reasoning": sql_result.get("reasoning", ""),
-            "confidence": sql_result.get("confidence", 0)
-        }
-    
-    sql = sql_result["sql"]
-    logger.info(f"Generated SQL: {sql[:100]}...")
-    
-    # Step 3: Validate SQL
-    validation = validate_sql(sql, schema)
-    if not validation["valid"]:
-        return {
-            "success": False,
-            "error": f"SQL validation failed: {'; '.join(validation['errors'])}",
-            "sql": sql
-        }
-    
-    # Step 4: Execute query
-    logger.info("Executing query...")
-    results = execute_query(sql, database)
-    logger.info(f"Query returned {results['row_count']} rows in {results['execution_time_ms']}ms")
-    
-    # Step 5: Summarize
-    logger.info("Summarizing results...")
-    summary = summarize_results(question, sql, results)
-    
-    # Step 6: Export to XML
-    logger.info("Exporting to XML...")
-    xml_content = results_to_xml(question, sql, results, summary)
+    start_ns = time.perf_counter_ns()
+    
+    cache_ttl = get_env_int("QUERY_CACHE_TTL_SECONDS", 0)
+    cache_key = None
+    if cache_ttl > 0 and not storage_path and not refresh_schema:
+        cache_key = _question_cache_key(question, database, table_filter)
+        cached = _question_cache_get(cache_key, cache_ttl)
+        if cached is not None:
+            logger.info("Using cached result for an equivalent question")
+            cached["cached"] = True
+            return cached
+    
+    # Steps 1-4 share one connection instead of connecting for schema
+    # discovery and again for execution
+    with db_connection(database) as (conn, _):
+        # Step 1: Discover schema
+        logger.info("Discovering schema...")
+        schema = discover_schema(database, table_filter, conn=conn, refresh=refresh_schema)
+        
+        if not schema["tables"]:
+            raise ValueError("No tables found in database")
+        
+        logger.info(f"Found {len(schema['tables'])} tables")
+        
+        # End the discovery transaction so the connection isn't left idle in
+        # a transaction (holding its snapshot and locks) while the LLM runs
+        conn.rollback()
+        
+        # Step 2: Generate SQL
+        sql_result = generate_sql(question, schema)
+        
+        if sql_result.get("error") or not sql_result.get("sql"):
+            return {
+                "success": False,
+                "error": sql_result.get("error", "Failed to generate SQL"),
+                "reasoning": sql_result.get("reasoning", ""),
+                "confidence": sql_result.get("confidence", 0)
+            }
+        
+        sql = sql_result["sql"]
+        logger.info(f"Generated SQL: {sql[:100]}...")
+        
+        # Step 3: Validate SQL
+        validation = validate_sql(sql, schema)
+        if not validation["valid"]:
+            return {
+                "success": False,
+                "error": f"SQL validation failed: {'; '.join(validation['errors'])}",
+                "sql": sql
+            }
+        
+        # Step 4: Execute query
+        logger.info("Executing query...")
+        try:
+            results = execute_query(sql, database, conn=conn)
+        except Exception as e:
+            # SQL written against a stale cached schema; rediscover next time
+            if _STALE_SCHEMA_RE.search(str(e)):
+                _forget_schema(database)
+            raise
+        logger.info(f"Query returned {results['row_count']} rows in {results['execution_time_ms']}ms")
     
     # Generate filename
     if storage_path:
@@ -876,11 +1828,25 @@ def query(
         safe_name = re.sub(r'[^a-zA-Z0-9_]', '_', question[:30])
         filename = f"{safe_name}_{timestamp}.xml"
     
-    storage_result = save_to_storage(xml_content, filename)
+    # Steps 5 and 6: the rows don't depend on the summary, so serialize
+    # them while the LLM writes it. They go to a spool file that spills to
+    # disk past XML_SPOOL_MAX_MEMORY; only the head waits for the summary.
+    with tempfile.SpooledTemporaryFile(max_size=XML_SPOOL_MAX_MEMORY) as rows_spool:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            logger.info("Summarizing results...")
+            summary_future = executor.submit(summarize_results, question, sql, results)
+            logger.info("Exporting to XML...")
+            for chunk in _iter_xml_rows(results):
+                rows_spool.write(chunk)
+            summary = summary_future.result()
+        
+        rows_spool.seek(0)
+        xml_content = _iter_spooled_xml(_xml_head(question, sql, results, summary), rows_spool)
+        storage_result = save_to_storage(xml_content, filename)
     
-    duration = (datetime.now() - start_time).total_seconds()
+    duration = (time.perf_counter_ns() - start_ns) / 1e9
     
-    return {
+    result = {
         "success": True,
         "sql": sql,
         "row_count": results["row_count"],
@@ -895,6 +1861,54 @@ def query(
         "reasoning": sql_result.get("reasoning", ""),
         "execution_time_seconds": round(duration, 2)
     }
+    
+    if cache_key:
+        _question_cache_set(cache_key, result)
+    return result
+
+
+def query_batch(
+    questions: list,
+    database: str = None,
+    table_filter: list = None,
+    concurrency: int = None,
+    storage_paths: list = None
+) -> list:
+    """Run several questions concurrently.
+    
+    Each question spends most of its time waiting on the LLM, the database
+    or storage, so a small thread pool overlaps that latency across
+    questions. The schema is discovered once up front and shared through
+    the schema cache.
+    
+    Args:
+        questions: Natural language questions
+        database: Database name (optional)
+        table_filter: List of table names to use (optional)
+        concurrency: Worker count (default QUERY_CONCURRENCY or 4)
+        storage_paths: Custom storage path per question (optional)
+    
+    Returns:
+        List of query() results in the same order as questions; a question
+        that raised gets {"success": False, "error": ...}
+    """
+    if concurrency is None:
+        concurrency = get_env_int("QUERY_CONCURRENCY", 4)
+    
+    discover_schema(database, table_filter)
+    
+    if storage_paths is None:
+        storage_paths = [None] * len(questions)
+    
+    def run(question, storage_path):
+        try:
+            return query(question, database, table_filter, storage_path)
+        except Exception as e:
+            logger.error(f"Query failed for {question[:60]}: {e}")
+            return {"success": False, "error": str(e)}
+    
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(run, questions, storage_paths))
 
 
 def main():
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Tests for question cache keys."""
+
+import unittest
+
+from query_agent import _question_cache_key
+
+
+def key(question: str) -> str:
+    return _question_cache_key(question, "analytics", None)
+
+
+class QuestionCacheKeyTest(unittest.TestCase):
+    def test_rephrasings_share_a_key(self):
+        self.assertEqual(key("Show me the Q1 orders"), key("Q1 order, please"))
+        self.assertEqual(key("List all customers!"), key("all customer"))
+    
+    def test_tense_changes_the_key(self):
+        self.assertNotEqual(
+            key("How many orders were pending"),
+            key("How many orders are pending")
+        )
+        self.assertNotEqual(key("What is the revenue"), key("What was the revenue"))
+    
+    def test_singular_words_ending_in_s_are_kept(self):
+        self.assertNotEqual(key("orders by status"), key("orders by statu"))
+        self.assertNotEqual(key("churn analysis"), key("churn analysi"))
+        self.assertNotEqual(key("sales by address"), key("sales by addres"))
+    
+    def test_word_order_matters(self):
+        self.assertNotEqual(key("revenue by customer"), key("customer by revenue"))
+
+
+if __name__ == "__main__":
+    unittest.main()
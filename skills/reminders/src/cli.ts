@@ -120,6 +120,18 @@ async function listReminders() {
   const includeCompleted = args.includes('--all');
   const limit = parseInt(getArg('--limit') || '50');
 
+  if (args.includes('--json')) {
+    // Written row by row, so large lists (--limit 0) never sit in memory
+    let first = true;
+    process.stdout.write('{"reminders":[');
+    const count = await reminders.forEachReminder({ includeCompleted, limit }, (reminder) => {
+      process.stdout.write((first ? '' : ',') + JSON.stringify(reminder));
+      first = false;
+    });
+    process.stdout.write(`],"count":${count}}\n`);
+    return;
+  }
+
   const list = await reminders.listReminders({ includeCompleted, limit });
 
   console.log(`\nReminders (${list.length}):`);
@@ -170,19 +182,28 @@ async function getReminder() {
 }
 
 async function completeReminder() {
-  const id = parseInt(args[0]);
-  if (isNaN(id)) {
-    console.error('Usage: reminders complete <id>');
+  const ids = args.map(arg => parseInt(arg));
+  if (ids.length === 0 || ids.some(id => isNaN(id))) {
+    console.error('Usage: reminders complete <id> [id...]');
     process.exit(1);
   }
 
-  const result = await reminders.completeReminder(id);
+  // Several ids are completed in one transaction
+  const results = await reminders.completeReminders(ids);
   
-  if (result.movedToHistory) {
-    console.log(`✓ Reminder ${id} completed and moved to history`);
-  } else if (result.nextOccurrence) {
-    console.log(`✓ Reminder ${id} completed`);
-    console.log(`  Next occurrence: ${formatDateTime(result.nextOccurrence.toISOString())}`);
+  for (const result of results) {
+    if (!result.success) {
+      console.error(`✗ Reminder ${result.id} not found`);
+    } else if (result.movedToHistory) {
+      console.log(`✓ Reminder ${result.id} completed and moved to history`);
+    } else if (result.nextOccurrence) {
+      console.log(`✓ Reminder ${result.id} completed`);
+      console.log(`  Next occurrence: ${formatDateTime(result.nextOccurrence.toISOString())}`);
+    }
+  }
+
+  if (results.some(result => !result.success)) {
+    process.exitCode = 1;
   }
 }
 
@@ -252,7 +273,7 @@ async function showStats() {
 }
 
 async function runDaemon() {
-  const result = await reminders.daemonCheck();
+  const result = await reminders.daemonCheck({ complete: args.includes('--complete') });
 
   if (result.count === 0) {
     console.log(JSON.stringify({ notifications: [], count: 0 }));
@@ -361,15 +382,15 @@ Commands:
   recurring <type> <time> <msg>    Create a recurring reminder
                                    Type: daily, weekly, monthly
   
-  list                             List all pending reminders [--all, --limit N]
+  list                             List all pending reminders [--all, --limit N, --json]
   due                              List reminders that are due now
   get <id>                         Get details of a specific reminder
-  complete <id>                    Mark a reminder as complete
+  complete <id> [id...]            Mark reminders as complete
   snooze <id> <minutes>            Snooze a reminder
   delete <id>                      Delete a reminder
   history                          Show completed reminders [--limit N]
   stats                            Show reminder statistics
-  daemon                           Check for due reminders (JSON output)
+  daemon [--complete]              Check for due reminders (JSON output)
   health                           Run health check
   parse <datetime>                 Test natural language parsing
 
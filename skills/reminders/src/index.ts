@@ -82,6 +82,112 @@ export interface HealthCheckResult {
   error?: string;
 }
 
+/**
+ * Result of completing one reminder in a batch
+ */
+export interface CompleteReminderResult {
+  id: number;
+  success: boolean;
+  nextOccurrence?: Date;
+  movedToHistory?: boolean;
+}
+
+// Ids bound per `IN (...)` statement, well under SQLite's variable limit
+const IN_CHUNK_SIZE = 500;
+
+/**
+ * Keyword datetimes understood by parseNaturalDateTime
+ * A Map, so user input like "constructor" can't match an Object.prototype key
+ */
+const DATE_KEYWORDS = new Map<string, (now: Date) => Date>([
+  ['now', (now) => now],
+  ['today', (now) => now],
+  ['tomorrow', (now) => {
+    const tomorrow = new Date(now);
+    tomorrow.setDate(tomorrow.getDate() + 1);
+    return tomorrow;
+  }],
+]);
+
+/**
+ * Relative offsets: "in 2 hours", "in 30 mins", "in a day"
+ */
+const RELATIVE_PATTERN = /^in\s+(\d+|an?)\s+(hour|minute|min|day|week)s?$/;
+
+const RELATIVE_UNITS: Record<string, (date: Date, num: number) => void> = {
+  hour: (date, num) => date.setHours(date.getHours() + num),
+  minute: (date, num) => date.setMinutes(date.getMinutes() + num),
+  min: (date, num) => date.setMinutes(date.getMinutes() + num),
+  day: (date, num) => date.setDate(date.getDate() + num),
+  week: (date, num) => date.setDate(date.getDate() + num * 7),
+};
+
+/**
+ * "YYYY-MM-DD HH:MM" (local time) or "HH:MM"
+ */
+const FIXED_FORMAT_PATTERN = /^(?:(?<year>\d{4})-(?<month>\d{2})-(?<day>\d{2})\s+(?<hour>\d{2}):(?<minute>\d{2})|(?<timeHour>\d{2}):(?<timeMinute>\d{2}))$/;
+
+/**
+ * Next scheduled time of a recurring reminder
+ */
+function nextOccurrence(reminder: Reminder): Date {
+  const nextScheduled = new Date(reminder.scheduledAt);
+
+  switch (reminder.reminderType) {
+    case 'daily':
+      nextScheduled.setDate(nextScheduled.getDate() + 1);
+      break;
+    case 'weekly':
+      nextScheduled.setDate(nextScheduled.getDate() + 7);
+      break;
+    case 'monthly':
+      nextScheduled.setMonth(nextScheduled.getMonth() + 1);
+      break;
+    default:
+      throw new Error(`Unknown reminder type: ${reminder.reminderType}`);
+  }
+
+  return nextScheduled;
+}
+
+/**
+ * SELECT for listReminders / forEachReminder
+ */
+function listQuery(options: ListRemindersOptions): { sql: string; params: any[] } {
+  let sql = `
+    SELECT 
+      id,
+      message,
+      scheduled_at as scheduledAt,
+      reminder_type as reminderType,
+      created_at as createdAt,
+      completed_at as completedAt,
+      snooze_until as snoozeUntil
+    FROM reminders
+    WHERE 1=1
+  `;
+
+  const params: any[] = [];
+
+  if (!options.includeCompleted) {
+    sql += ` AND completed_at IS NULL`;
+  }
+
+  sql += ` ORDER BY scheduled_at ASC`;
+
+  if (options.limit) {
+    sql += ` LIMIT ?`;
+    params.push(options.limit);
+  }
+
+  if (options.offset) {
+    sql += ` OFFSET ?`;
+    params.push(options.offset);
+  }
+
+  return { sql, params };
+}
+
 // Promisify database operations
 function run(db: sqlite3.Database, sql: string, params: any[] = []): Promise<void> {
   return new Promise((resolve, reject) => {
@@ -127,6 +233,7 @@ export class RemindersSkill {
   private dbPath: string;
   private db: sqlite3.Database | null = null;
   private initPromise: Promise<void> | null = null;
+  private writeQueue: Promise<unknown> = Promise.resolve();
 
   constructor(dbPath?: string) {
     this.dbPath = dbPath || path.join(os.homedir(), '.openclaw', 'skills', 'reminders', 'reminders.db');
@@ -152,6 +259,12 @@ export class RemindersSkill {
       });
     });
 
+    // WAL lets the daemon read while the CLI writes, and with
+    // synchronous=NORMAL a commit no longer waits on an fsync
+    await run(this.db, `PRAGMA journal_mode = WAL`);
+    await run(this.db, `PRAGMA synchronous = NORMAL`);
+    await run(this.db, `PRAGMA temp_store = MEMORY`);
+
     // Create tables
     await run(this.db, `
       CREATE TABLE IF NOT EXISTS reminders (
@@ -173,6 +286,12 @@ export class RemindersSkill {
       CREATE INDEX IF NOT EXISTS idx_reminders_completed ON reminders(completed_at)
     `);
 
+    // Pending reminders in schedule order: getDueReminders() and the daemon
+    // check become an index range scan with no sort
+    await run(this.db, `
+      CREATE INDEX IF NOT EXISTS idx_pending_due ON reminders(completed_at, scheduled_at, snooze_until)
+    `);
+
     await run(this.db, `
       CREATE TABLE IF NOT EXISTS history (
         id INTEGER PRIMARY KEY,
@@ -206,55 +325,38 @@ export class RemindersSkill {
     const inputLower = input.toLowerCase().trim();
 
     // Handle special keywords
-    if (inputLower === 'now') {
-      return now;
-    }
-
-    if (inputLower === 'today') {
-      return now;
+    const keyword = DATE_KEYWORDS.get(inputLower);
+    if (keyword) {
+      return keyword(now);
     }
 
-    if (inputLower === 'tomorrow') {
-      const tomorrow = new Date(now);
-      tomorrow.setDate(tomorrow.getDate() + 1);
-      return tomorrow;
-    }
-
-    // Handle "in X unit" format
-    const inMatch = inputLower.match(/^in\s+(\d+)\s+(hour|hours|minute|minutes|min|mins|day|days|week|weeks)$/);
+    // Handle "in X unit" and "in a/an unit" format
+    const inMatch = RELATIVE_PATTERN.exec(inputLower);
     if (inMatch) {
-      const num = parseInt(inMatch[1], 10);
-      const unit = inMatch[2];
+      const num = inMatch[1] === 'a' || inMatch[1] === 'an' ? 1 : parseInt(inMatch[1], 10);
       const result = new Date(now);
-
-      if (unit.startsWith('hour')) {
-        result.setHours(result.getHours() + num);
-      } else if (unit.startsWith('min')) {
-        result.setMinutes(result.getMinutes() + num);
-      } else if (unit.startsWith('day')) {
-        result.setDate(result.getDate() + num);
-      } else if (unit.startsWith('week')) {
-        result.setDate(result.getDate() + num * 7);
-      }
+      RELATIVE_UNITS[inMatch[2]](result, num);
       return result;
     }
 
-    // Handle "in an hour" / "in a minute" / "in a day"
-    const inAMatch = inputLower.match(/^in\s+(a|an)\s+(hour|minute|min|day|week)$/);
-    if (inAMatch) {
-      const unit = inAMatch[2];
-      const result = new Date(now);
-
-      if (unit.startsWith('hour')) {
-        result.setHours(result.getHours() + 1);
-      } else if (unit.startsWith('min')) {
-        result.setMinutes(result.getMinutes() + 1);
-      } else if (unit.startsWith('day')) {
-        result.setDate(result.getDate() + 1);
-      } else if (unit.startsWith('week')) {
-        result.setDate(result.getDate() + 7);
+    // "YYYY-MM-DD HH:MM" or "HH:MM", in one match
+    const fixed = FIXED_FORMAT_PATTERN.exec(input);
+    if (fixed?.groups) {
+      const { year, month, day, hour, minute, timeHour, timeMinute } = fixed.groups;
+      if (year) {
+        const date = new Date(parseInt(year), parseInt(month) - 1, parseInt(day), parseInt(hour), parseInt(minute));
+        if (!isNaN(date.getTime())) {
+          return date;
+        }
+      } else {
+        // Today at specific time, or tomorrow if passed
+        const date = new Date(now);
+        date.setHours(parseInt(timeHour), parseInt(timeMinute), 0, 0);
+        if (date < now) {
+          date.setDate(date.getDate() + 1);
+        }
+        return date;
       }
-      return result;
     }
 
     // Try parsing as ISO date
@@ -263,30 +365,6 @@ export class RemindersSkill {
       return isoDate;
     }
 
-    // Try parsing "YYYY-MM-DD HH:MM"
-    const dateTimeMatch = input.match(/^(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2})$/);
-    if (dateTimeMatch) {
-      const [_, year, month, day, hour, minute] = dateTimeMatch;
-      const date = new Date(parseInt(year), parseInt(month) - 1, parseInt(day), parseInt(hour), parseInt(minute));
-      if (!isNaN(date.getTime())) {
-        return date;
-      }
-    }
-
-    // Try parsing "HH:MM" (today at specific time, or tomorrow if passed)
-    const timeMatch = input.match(/^(\d{2}):(\d{2})$/);
-    if (timeMatch) {
-      const [_, hour, minute] = timeMatch;
-      const date = new Date(now);
-      date.setHours(parseInt(hour), parseInt(minute), 0, 0);
-      
-      // If time has already passed today, use tomorrow
-      if (date < now) {
-        date.setDate(date.getDate() + 1);
-      }
-      return date;
-    }
-
     throw new Error(`Unable to parse datetime: "${input}". Try formats like "2026-02-15 14:00", "tomorrow", "in 2 hours", or "in 30 minutes"`);
   }
 
@@ -300,10 +378,10 @@ export class RemindersSkill {
       ? options.scheduledAt.toISOString() 
       : options.scheduledAt;
 
-    const result = await runWithResult(this.db!,
+    const result = await this.serializeWrites(() => runWithResult(this.db!,
       `INSERT INTO reminders (message, scheduled_at, reminder_type) VALUES (?, ?, ?)`,
       [options.message, scheduledAt, 'once']
-    );
+    ));
 
     return {
       id: result.lastID,
@@ -328,10 +406,10 @@ export class RemindersSkill {
 
     const scheduledAt = startAt.toISOString();
 
-    const result = await runWithResult(this.db!,
+    const result = await this.serializeWrites(() => runWithResult(this.db!,
       `INSERT INTO reminders (message, scheduled_at, reminder_type) VALUES (?, ?, ?)`,
       [options.message, scheduledAt, options.type]
-    );
+    ));
 
     return {
       id: result.lastID,
@@ -350,48 +428,27 @@ export class RemindersSkill {
   async listReminders(options: ListRemindersOptions = {}): Promise<Reminder[]> {
     await this.ensureInitialized();
 
-    let sql = `
-      SELECT 
-        id,
-        message,
-        scheduled_at as scheduledAt,
-        reminder_type as reminderType,
-        created_at as createdAt,
-        completed_at as completedAt,
-        snooze_until as snoozeUntil
-      FROM reminders
-      WHERE 1=1
-    `;
-
-    const params: any[] = [];
-
-    if (!options.includeCompleted) {
-      sql += ` AND completed_at IS NULL`;
-    }
-
-    sql += ` ORDER BY scheduled_at ASC`;
-
-    if (options.limit) {
-      sql += ` LIMIT ?`;
-      params.push(options.limit);
-    }
-
-    if (options.offset) {
-      sql += ` OFFSET ?`;
-      params.push(options.offset);
-    }
+    const { sql, params } = listQuery(options);
+    return all<Reminder>(this.db!, sql, params);
+  }
 
-    const rows = await all<{
-      id: number;
-      message: string;
-      scheduledAt: string;
-      reminderType: ReminderType;
-      createdAt: string;
-      completedAt: string | null;
-      snoozeUntil: string | null;
-    }>(this.db!, sql, params);
+  /**
+   * Call onRow for each reminder as it is read, without building the list
+   * Resolves to the number of reminders visited
+   */
+  async forEachReminder(options: ListRemindersOptions, onRow: (reminder: Reminder) => void): Promise<number> {
+    await this.ensureInitialized();
 
-    return rows;
+    const { sql, params } = listQuery(options);
+    return new Promise((resolve, reject) => {
+      this.db!.each(sql, params, (err, row) => {
+        if (err) reject(err);
+        else onRow(row as Reminder);
+      }, (err, count) => {
+        if (err) reject(err);
+        else resolve(count);
+      });
+    });
   }
 
   /**
@@ -469,55 +526,106 @@ export class RemindersSkill {
     nextOccurrence?: Date;
     movedToHistory?: boolean;
   }> {
+    const [result] = await this.completeReminders([id]);
+    if (!result.success) {
+      throw new Error(`Reminder ${id} not found`);
+    }
+    return { success: true, nextOccurrence: result.nextOccurrence, movedToHistory: result.movedToHistory };
+  }
+
+  /**
+   * Mark several reminders as complete in a single transaction
+   * Duplicate ids are completed once; results follow the order of first
+   * appearance, and unknown ids get success: false
+   */
+  async completeReminders(ids: number[]): Promise<CompleteReminderResult[]> {
     await this.ensureInitialized();
 
-    const reminder = await this.getReminder(id);
-    if (!reminder) {
-      throw new Error(`Reminder ${id} not found`);
+    const uniqueIds = [...new Set(ids)];
+    if (uniqueIds.length === 0) {
+      return [];
     }
 
-    if (reminder.reminderType === 'once') {
-      // Move to history
-      await run(this.db!, `
-        INSERT INTO history (id, message, scheduled_at, completed_at)
-        VALUES (?, ?, ?, ?)
-      `, [reminder.id, reminder.message, reminder.scheduledAt, new Date().toISOString()]);
-
-      // Delete from reminders
-      await run(this.db!, `DELETE FROM reminders WHERE id = ?`, [id]);
-
-      return { success: true, movedToHistory: true };
-    } else {
-      // Recurring - calculate next occurrence
-      const currentScheduled = new Date(reminder.scheduledAt);
-      let nextScheduled: Date;
-
-      switch (reminder.reminderType) {
-        case 'daily':
-          nextScheduled = new Date(currentScheduled);
-          nextScheduled.setDate(nextScheduled.getDate() + 1);
-          break;
-        case 'weekly':
-          nextScheduled = new Date(currentScheduled);
-          nextScheduled.setDate(nextScheduled.getDate() + 7);
-          break;
-        case 'monthly':
-          nextScheduled = new Date(currentScheduled);
-          nextScheduled.setMonth(nextScheduled.getMonth() + 1);
-          break;
-        default:
-          throw new Error(`Unknown reminder type: ${reminder.reminderType}`);
+    return this.serializeWrites(() => this.completeRemindersNow(uniqueIds));
+  }
+
+  private async completeRemindersNow(ids: number[]): Promise<CompleteReminderResult[]> {
+    const byId = new Map<number, Reminder>();
+    for (let start = 0; start < ids.length; start += IN_CHUNK_SIZE) {
+      const chunk = ids.slice(start, start + IN_CHUNK_SIZE);
+      const placeholders = chunk.map(() => '?').join(', ');
+      const rows = await all<Reminder>(this.db!, `
+        SELECT 
+          id,
+          message,
+          scheduled_at as scheduledAt,
+          reminder_type as reminderType,
+          created_at as createdAt,
+          completed_at as completedAt,
+          snooze_until as snoozeUntil
+        FROM reminders
+        WHERE id IN (${placeholders})
+      `, chunk);
+      for (const row of rows) {
+        byId.set(row.id, row);
       }
+    }
 
-      // Update with next occurrence
-      await run(this.db!, `
-        UPDATE reminders 
-        SET scheduled_at = ?, snooze_until = NULL 
-        WHERE id = ?
-      `, [nextScheduled.toISOString(), id]);
+    const completedAt = new Date().toISOString();
+    const results: CompleteReminderResult[] = [];
 
-      return { success: true, nextOccurrence: nextScheduled };
+    // One commit for the whole batch instead of one (or two) per reminder
+    await run(this.db!, `BEGIN`);
+    try {
+      for (const id of ids) {
+        const reminder = byId.get(id);
+        if (!reminder) {
+          results.push({ id, success: false });
+          continue;
+        }
+
+        if (reminder.reminderType === 'once') {
+          // Move to history
+          await run(this.db!, `
+            INSERT INTO history (id, message, scheduled_at, completed_at)
+            VALUES (?, ?, ?, ?)
+          `, [reminder.id, reminder.message, reminder.scheduledAt, completedAt]);
+
+          // Delete from reminders
+          await run(this.db!, `DELETE FROM reminders WHERE id = ?`, [id]);
+
+          results.push({ id, success: true, movedToHistory: true });
+        } else {
+          // Recurring - update with next occurrence
+          const nextScheduled = nextOccurrence(reminder);
+          await run(this.db!, `
+            UPDATE reminders 
+            SET scheduled_at = ?, snooze_until = NULL 
+            WHERE id = ?
+          `, [nextScheduled.toISOString(), id]);
+
+          results.push({ id, success: true, nextOccurrence: nextScheduled });
+        }
+      }
+      await run(this.db!, `COMMIT`);
+    } catch (error) {
+      await run(this.db!, `ROLLBACK`);
+      throw error;
     }
+
+    return results;
+  }
+
+  /**
+   * Run fn after every previously queued write has settled
+   * All writes share one connection, so a write issued while a batch's
+   * BEGIN ... COMMIT is open would otherwise be committed or rolled back
+   * with that batch
+   */
+  private serializeWrites<T>(fn: () => Promise<T>): Promise<T> {
+    const result = this.writeQueue.then(fn);
+    this.writeQueue = result.catch(() => undefined);
+    return result;
   }
 
   /**
@@ -530,11 +638,11 @@ export class RemindersSkill {
     snoozeUntil.setMinutes(snoozeUntil.getMinutes() + minutes);
     const snoozeUntilStr = snoozeUntil.toISOString();
 
-    await run(this.db!, `
+    await this.serializeWrites(() => run(this.db!, `
       UPDATE reminders 
       SET snooze_until = ? 
       WHERE id = ? AND completed_at IS NULL
-    `, [snoozeUntilStr, id]);
+    `, [snoozeUntilStr, id]));
 
     const reminder = await this.getReminder(id);
     if (!reminder) {
@@ -550,7 +658,9 @@ export class RemindersSkill {
   async deleteReminder(id: number): Promise<boolean> {
     await this.ensureInitialized();
 
-    const result = await runWithResult(this.db!, `DELETE FROM reminders WHERE id = ?`, [id]);
+    const result = await this.serializeWrites(() =>
+      runWithResult(this.db!, `DELETE FROM reminders WHERE id = ?`, [id])
+    );
     return result.changes > 0;
   }
 
@@ -639,13 +749,18 @@ export class RemindersSkill {
 
   /**
    * Run daemon check - returns due reminders for notification
+   * With complete: true, the returned reminders are also marked complete
    */
-  async daemonCheck(): Promise<{
+  async daemonCheck(options: { complete?: boolean } = {}): Promise<{
     notifications: Reminder[];
     count: number;
     timestamp: string;
   }> {
     const due = await this.getDueReminders();
+    if (options.complete && due.length > 0) {
+      // Advance everything that was just notified in one transaction
+      await this.completeReminders(due.map(r => r.id));
+    }
     return {
       notifications: due,
       count: due.length,
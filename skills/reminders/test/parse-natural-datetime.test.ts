@@ -0,0 +1,42 @@
+/**
+ * parseNaturalDateTime keyword handling
+ */
+
+import { test, after } from 'node:test';
+import assert from 'node:assert/strict';
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { RemindersSkill } from '../src/index.ts';
+
+const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'reminders-test-'));
+const reminders = new RemindersSkill(path.join(dir, 'reminders.db'));
+
+after(async () => {
+  await reminders.close();
+  fs.rmSync(dir, { recursive: true, force: true });
+});
+
+test('keywords still resolve', () => {
+  const before = Date.now();
+  const tomorrow = reminders.parseNaturalDateTime('Tomorrow');
+  assert.ok(tomorrow.getTime() - before >= 23 * 60 * 60 * 1000);
+  assert.ok(Math.abs(reminders.parseNaturalDateTime(' now ').getTime() - before) < 1000);
+});
+
+test('Object.prototype keys fall through to the normal parser', () => {
+  for (const input of ['constructor', '__proto__', 'toString', 'hasOwnProperty', 'valueOf']) {
+    assert.throws(
+      () => reminders.parseNaturalDateTime(input),
+      /Unable to parse datetime/,
+      input
+    );
+  }
+});
+
+test('ISO dates still parse', () => {
+  assert.equal(
+    reminders.parseNaturalDateTime('2026-02-15T14:00:00Z').toISOString(),
+    '2026-02-15T14:00:00.000Z'
+  );
+});